@@ -0,0 +1,138 @@
+"""
+Word-level alignment for pronunciation scoring:
+- Normalizes French text (case, accents, punctuation, elision like "l'")
+- Levenshtein alignment over word tokens with a NumPy row-vectorized DP
+  (two distance rows plus a uint8 backpointer matrix, capped at ALIGN_MAX_CELLS)
+- Per-word ops: match / substitute / insert / delete, plus WER and a 0-1 score
+- Batch API scoring many attempts against the same expected text
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+MATCH, SUBSTITUTE, INSERT, DELETE = "match", "substitute", "insert", "delete"
+
+# Backpointer cells are one byte each: 25M cells (~25 MB) is a 5000 x 5000-word passage
+MAX_ALIGN_CELLS = int(os.getenv("ALIGN_MAX_CELLS", "25000000"))
+_DIAG, _UP, _LEFT = 0, 1, 2  # substitute/match, delete, insert
+
+# Elided forms written with an apostrophe: "l'homme", "qu'il", "jusqu'à"
+_ELISION = re.compile(r"\b(l|d|j|m|n|s|t|c|qu|jusqu|lorsqu|puisqu)'", re.IGNORECASE)
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'"})
+_NON_WORD = re.compile(r"[^\w']+")
+
+
+def _strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split text into (surface, normalized) word pairs.
+
+    Elided articles/pronouns become their own token so "l'homme" and
+    "l homme" align identically.
+    """
+    text = (text or "").translate(_APOSTROPHES)
+    text = _ELISION.sub(lambda m: m.group(0) + " ", text)
+    tokens = []
+    for surface in text.split():
+        norm = _NON_WORD.sub("", _strip_accents(surface.lower())).replace("'", "")
+        if norm:
+            tokens.append((surface.strip(".,;:!?«»\"()"), norm))
+    return tokens
+
+
+def normalize(text: str) -> str:
+    """Space-joined normalized tokens, e.g. "L'Été!" -> "l ete"."""
+    return " ".join(norm for _, norm in tokenize(text))
+
+
+def _backpointers(ref: np.ndarray, hyp: np.ndarray) -> np.ndarray:
+    """(len(ref)+1) x (len(hyp)+1) uint8 matrix of Levenshtein moves.
+
+    Each row is computed without a Python inner loop: deletions and
+    substitutions come from the previous row, and the insertion chain along
+    the row is a running minimum of (cost - j), shifted back by j. Only two
+    distance rows are kept; ties prefer the diagonal, then deletion, so
+    substitutions beat delete+insert pairs. Raises ValueError above
+    MAX_ALIGN_CELLS cells.
+    """
+    n, m = len(ref), len(hyp)
+    if (n + 1) * (m + 1) > MAX_ALIGN_CELLS:
+        raise ValueError(f"cannot align {n} x {m} words (ALIGN_MAX_CELLS={MAX_ALIGN_CELLS})")
+    back = np.empty((n + 1, m + 1), dtype=np.uint8)
+    back[0] = _LEFT
+    back[:, 0] = _UP
+    cols = np.arange(m + 1, dtype=np.int32)
+    prev = cols
+    for i in range(1, n + 1):
+        sub = prev[:-1] + (hyp != ref[i - 1])
+        up = prev[1:] + 1
+        row = np.empty(m + 1, dtype=np.int32)
+        row[0] = i
+        row[1:] = np.minimum(up, sub)
+        row = np.minimum.accumulate(row - cols) + cols
+        back[i, 1:] = np.where(row[1:] == sub, _DIAG, np.where(row[1:] == up, _UP, _LEFT))
+        prev = row
+    return back
+
+
+def _encode(ref_norm: List[str], hyp_norm: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    vocab: Dict[str, int] = {}
+    ref = np.fromiter((vocab.setdefault(w, len(vocab)) for w in ref_norm), dtype=np.int32, count=len(ref_norm))
+    hyp = np.fromiter((vocab.setdefault(w, len(vocab)) for w in hyp_norm), dtype=np.int32, count=len(hyp_norm))
+    return ref, hyp
+
+
+def _align_tokens(ref_tokens: List[Tuple[str, str]], hyp_tokens: List[Tuple[str, str]]) -> Dict:
+    ref, hyp = _encode([t[1] for t in ref_tokens], [t[1] for t in hyp_tokens])
+    back = _backpointers(ref, hyp)
+
+    ops = []
+    i, j = len(ref), len(hyp)
+    while i > 0 or j > 0:
+        move = back[i, j]
+        if move == _DIAG:
+            op = MATCH if ref[i - 1] == hyp[j - 1] else SUBSTITUTE
+            ops.append({"op": op, "expected": ref_tokens[i - 1][0], "actual": hyp_tokens[j - 1][0]})
+            i, j = i - 1, j - 1
+        elif move == _UP:
+            ops.append({"op": DELETE, "expected": ref_tokens[i - 1][0], "actual": None})
+            i -= 1
+        else:
+            ops.append({"op": INSERT, "expected": None, "actual": hyp_tokens[j - 1][0]})
+            j -= 1
+    ops.reverse()
+
+    counts = {MATCH: 0, SUBSTITUTE: 0, INSERT: 0, DELETE: 0}
+    for o in ops:
+        counts[o["op"]] += 1
+    errors = counts[SUBSTITUTE] + counts[INSERT] + counts[DELETE]
+    n = len(ref_tokens)
+    wer = errors / n if n else float(len(hyp_tokens) > 0)
+    return {
+        "ops": ops,
+        "matches": counts[MATCH],
+        "substitutions": counts[SUBSTITUTE],
+        "insertions": counts[INSERT],
+        "deletions": counts[DELETE],
+        "wer": wer,
+        "score": max(0.0, 1.0 - wer),
+    }
+
+
+def align(expected: str, actual: str) -> Dict:
+    """Align a transcription against the expected text word by word."""
+    return _align_tokens(tokenize(expected), tokenize(actual))
+
+
+def align_batch(expected: str, attempts: List[str]) -> List[Dict]:
+    """Align many attempts against one expected text (tokenized once)."""
+    ref_tokens = tokenize(expected)
+    return [_align_tokens(ref_tokens, tokenize(a)) for a in attempts]
@@ -3,25 +3,56 @@ FrenchConversationBot:
 - Simple retrieval-augmented generation (RAG)
 - Uses SentenceTransformers + FAISS for knowledge retrieval
 - Generates responses via DialoGPT
+- Quality modes (fast/balanced/best), see decoding.py
+- Optionally (CONVERSATION_VOCAB_RETRIEVAL=1) vocabulary entries join the retrieval
+  index using the store's precomputed embeddings
 """
 
 from transformers import AutoTokenizer, AutoModelForCausalLM
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
+import os
+import torch
+from typing import Optional
+
+from .decoding import resolve_quality, generation_kwargs, apply_thread_budget
+from ..metrics import stage_timer
+from ..profiling import span
+from ..vocab_store import get_vocab_store
+
+DIALOG_MODEL = "microsoft/DialoGPT-medium"
+SENTENCE_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+# Off by default: it changes which knowledge snippets end up in the prompt
+VOCAB_RETRIEVAL = os.getenv("CONVERSATION_VOCAB_RETRIEVAL", "0") == "1"
 
 class FrenchConversationBot:
     def __init__(self):
         # Conversational model
-        self.tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-medium")
-        self.model = AutoModelForCausalLM.from_pretrained("microsoft/DialoGPT-medium")
+        self.tokenizer = AutoTokenizer.from_pretrained(DIALOG_MODEL)
+        self.model = AutoModelForCausalLM.from_pretrained(DIALOG_MODEL)
 
         # Knowledge retrieval
-        self.sentence_model = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+        self.sentence_model = SentenceTransformer(SENTENCE_MODEL)
         self.knowledge_base = self.load_knowledge()
         embeddings = self.sentence_model.encode(self.knowledge_base)
         self.index = faiss.IndexFlatL2(embeddings.shape[1])
         self.index.add(embeddings.astype("float32"))
+        if VOCAB_RETRIEVAL:
+            self.add_vocabulary(get_vocab_store())
+
+    def add_vocabulary(self, store) -> None:
+        """Index vocabulary entries from the prebuilt store without re-embedding them."""
+        if store is None or not len(store) or not store.has("en_emb"):
+            return
+        if store.manifest.get("embedding_model") != SENTENCE_MODEL:
+            return
+        vectors = store.embeddings("en_emb")
+        if vectors.shape[1] != self.index.d:
+            return
+        english, french = store.strings("english"), store.strings("french")
+        self.knowledge_base += [f"'{en}' in French is '{fr}'." for en, fr in zip(english, french)]
+        self.index.add(vectors)
 
     def load_knowledge(self):
         return [
@@ -32,14 +63,33 @@ class FrenchConversationBot:
         ]
 
     def retrieve_relevant_knowledge(self, query: str, k: int = 3):
-        query_emb = self.sentence_model.encode([query])
-        D, I = self.index.search(query_emb.astype("float32"), k)
+        with span("retrieve_relevant_knowledge"):
+            return self._retrieve(query, k)
+
+    def _retrieve(self, query: str, k: int):
+        with stage_timer(SENTENCE_MODEL, "encode"):
+            query_emb = self.sentence_model.encode([query])
+        with stage_timer("faiss", "search"):
+            D, I = self.index.search(query_emb.astype("float32"), k)
         return [self.knowledge_base[i] for i in I[0]]
 
-    def generate_response(self, user_input: str, scenario: str = "general") -> str:
+    def generate_response(self, user_input: str, scenario: str = "general", quality: Optional[str] = None) -> str:
+        quality = resolve_quality(quality)
         knowledge = self.retrieve_relevant_knowledge(user_input)
         context = f"Scenario: {scenario}\nRelevant info: {' '.join(knowledge)}\nUser: {user_input}\nBot:"
-        inputs = self.tokenizer.encode(context, return_tensors="pt")
-        outputs = self.model.generate(inputs, max_length=inputs.shape[1] + 50)
-        response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        with stage_timer(DIALOG_MODEL, "tokenize"):
+            inputs = self.tokenizer.encode(context, return_tensors="pt")
+            # Size the reply budget from the user's message, not the whole prompt
+            user_len = len(self.tokenizer.encode(user_input))
+        # Greedy like the original bot; the floor keeps replies to short messages from being clipped
+        gen_kwargs = generation_kwargs(quality, user_len, max_cap=50, num_beams=1, min_tokens=32)
+        apply_thread_budget()
+        with stage_timer(DIALOG_MODEL, "generate"), torch.no_grad():
+            outputs = self.model.generate(
+                inputs,
+                pad_token_id=self.tokenizer.eos_token_id,
+                **gen_kwargs,
+            )
+        with stage_timer(DIALOG_MODEL, "decode"):
+            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
         return response.split("Bot:")[-1].strip()
@@ -0,0 +1,113 @@
+"""
+Decoding policy shared by the translator and the conversation bot:
+- Request-level quality modes: fast (greedy), balanced (small beam), best (the
+  caller's full beam and length budget, i.e. the pre-existing behaviour)
+- fast/balanced derive max_new_tokens from the input token length
+- Automatic downgrade to "fast", and a smaller torch thread count, when too many
+  inference requests are in flight
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Dict, Optional
+import os
+import threading
+
+DEFAULT_QUALITY = os.getenv("DEFAULT_QUALITY", "best")
+# Above this many in-flight/queued inference requests every call runs in "fast" mode
+DOWNGRADE_QUEUE_DEPTH = int(os.getenv("QUALITY_DOWNGRADE_QUEUE_DEPTH", "8"))
+
+# num_beams / length_ratio of None mean "the caller's own beam width / max_cap".
+# French output runs ~1.3x the English token count, so the ratios leave headroom.
+QUALITY_MODES: Dict[str, Dict] = {
+    "fast": {"num_beams": 1, "length_ratio": 2.0},
+    "balanced": {"num_beams": 2, "length_ratio": 3.0},
+    "best": {"num_beams": None, "length_ratio": None},
+}
+
+
+class LoadTracker:
+    """Counts inference requests currently waiting or running in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @contextmanager
+    def track(self):
+        with self._lock:
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+
+
+load_tracker = LoadTracker()
+
+
+def resolve_quality(quality: Optional[str], queue_depth: Optional[int] = None) -> str:
+    """Validate the requested mode and apply the overload downgrade."""
+    quality = (quality or DEFAULT_QUALITY).lower()
+    if quality not in QUALITY_MODES:
+        raise ValueError(f"unknown quality mode {quality!r}; expected one of {sorted(QUALITY_MODES)}")
+    depth = load_tracker.depth if queue_depth is None else queue_depth
+    if depth > DOWNGRADE_QUEUE_DEPTH:
+        return "fast"
+    return quality
+
+
+def generation_kwargs(
+    quality: str,
+    input_length: int,
+    max_cap: int,
+    num_beams: int = 4,
+    min_tokens: int = 16,
+) -> Dict:
+    """Build model.generate kwargs for an already-resolved quality mode.
+
+    `max_cap` and `num_beams` are the caller's full budget, used as-is by
+    "best"; `min_tokens` floors the length-derived budget of the other modes.
+    """
+    mode = QUALITY_MODES[quality]
+    beams = num_beams if mode["num_beams"] is None else min(num_beams, mode["num_beams"])
+    if mode["length_ratio"] is None:
+        max_new_tokens = max_cap
+    else:
+        max_new_tokens = max(min_tokens, min(max_cap, int(input_length * mode["length_ratio"]) + min_tokens))
+    kwargs = {"max_new_tokens": max_new_tokens, "num_beams": beams}
+    if beams > 1:
+        kwargs["early_stopping"] = True
+    return kwargs
+
+
+_thread_lock = threading.Lock()
+_default_threads: Optional[int] = None
+
+
+def apply_thread_budget(device=None, depth: Optional[int] = None) -> None:
+    """Split CPU threads between concurrent calls once the process is overloaded.
+
+    torch's thread count is process-global, so it is set here to a value
+    derived from the current load rather than saved and restored around each
+    call (overlapping calls would restore each other's values). At or below
+    DOWNGRADE_QUEUE_DEPTH it stays at torch's default.
+    """
+    if device is not None and device.type != "cpu":
+        return
+    # Imported here so API workers using the model server proxies never load torch
+    import torch
+
+    global _default_threads
+    depth = load_tracker.depth if depth is None else depth
+    with _thread_lock:
+        if _default_threads is None:
+            _default_threads = torch.get_num_threads()
+        target = _default_threads if depth <= DOWNGRADE_QUEUE_DEPTH else max(1, _default_threads // depth)
+        if torch.get_num_threads() != target:
+            torch.set_num_threads(target)
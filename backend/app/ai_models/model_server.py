@@ -0,0 +1,406 @@
+"""
+Model server:
+- Owns SmartTranslator, PronunciationChecker and FrenchConversationBot in one process
+- Serves calls from API workers over a local Unix socket
+- Micro-batches concurrent translate calls with the same source language
+- One worker thread per model (plus one for gTTS), so Whisper and TTS never
+  queue behind a translate batch
+- Thin client proxies with the same method signatures as the real classes
+
+Run the server (MODEL_SERVER_AUTHKEY is required and must match the API's):
+    MODEL_SERVER_AUTHKEY=... python -m app.ai_models.model_server
+
+Then start the API with USE_MODEL_SERVER=1 (and the same MODEL_SERVER_SOCKET), e.g.
+    MODEL_SERVER_AUTHKEY=... USE_MODEL_SERVER=1 uvicorn main:app --workers 8
+
+Messages are pickled, so only processes holding the auth key may connect; the
+socket is created owner-only (0600) inside a 0700 directory.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from .decoding import resolve_quality
+from ..metrics import BATCH_SIZE
+from ..profiling import span
+
+MODEL_SERVER_SOCKET = os.getenv(
+    "MODEL_SERVER_SOCKET",
+    os.path.join(tempfile.gettempdir(), f"french_models-{os.getuid()}", "models.sock"),
+)
+BATCH_WINDOW_MS = float(os.getenv("MODEL_SERVER_BATCH_WINDOW_MS", "5"))
+MAX_BATCH_SIZE = int(os.getenv("MODEL_SERVER_MAX_BATCH_SIZE", "16"))
+# Prometheus scrape port for metrics recorded inside the server process (0 = off)
+MODEL_SERVER_METRICS_PORT = int(os.getenv("MODEL_SERVER_METRICS_PORT", "0"))
+
+# Methods a client may call on each remote target
+EXPOSED_METHODS = {
+    "translator": {
+        "translate",
+        "translate_batch",
+        "translate_english_to_french",
+        "translate_with_confidence",
+    },
+    "pronunciation_checker": {
+        "transcribe_speech",
+        "transcribe_audio",
+        "check_pronunciation",
+        "score_transcription",
+        "score_attempts",
+        "similarity_score",
+        "generate_feedback",
+        "differences",
+        "generate_tts",
+    },
+    "conversation_bot": {
+        "retrieve_relevant_knowledge",
+        "generate_response",
+    },
+}
+
+
+# Methods that accept a quality= keyword (see decoding.py)
+QUALITY_METHODS = {"translate", "translate_batch", "generate_response"}
+
+
+class RemoteError(RuntimeError):
+    """Raised on the client when the model server reports a failure."""
+
+
+def _authkey() -> bytes:
+    # No default: a well-known key would let any local user send pickles to the server
+    key = os.getenv("MODEL_SERVER_AUTHKEY")
+    if not key:
+        raise RuntimeError("MODEL_SERVER_AUTHKEY must be set (shared secret between the API and the model server)")
+    return key.encode()
+
+
+# Worker threads; each model is only ever touched by its own lane
+LANES = ("translator", "pronunciation_checker", "tts", "conversation_bot")
+
+
+def _lane(target: str, method: str) -> str:
+    # gTTS is a network call that shares no state with Whisper
+    if target == "pronunciation_checker" and method == "generate_tts":
+        return "tts"
+    return target
+
+
+# ------------------- Server ---------------------------------------------
+
+class _Job:
+    __slots__ = ("target", "method", "args", "kwargs", "result", "error", "done")
+
+    def __init__(self, target: str, method: str, args: tuple, kwargs: dict):
+        self.target = target
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+
+class ModelServer:
+    def __init__(
+        self,
+        address: str = MODEL_SERVER_SOCKET,
+        authkey: Optional[bytes] = None,
+        targets: Optional[Dict[str, Any]] = None,
+    ):
+        self.address = address
+        self.authkey = authkey or _authkey()
+        self.targets = targets if targets is not None else self._load_targets()
+        self.lanes: Dict[str, "queue.Queue[_Job]"] = {lane: queue.Queue() for lane in LANES}
+
+    def _load_targets(self) -> Dict[str, Any]:
+        from ..startup import build_instances
+
+        # Model families load in parallel threads
+        return build_instances("local")
+
+    def _listen(self) -> Listener:
+        directory = os.path.dirname(os.path.abspath(self.address))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        old_umask = os.umask(0o177)  # bind() creates the socket file as 0600
+        try:
+            return Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        finally:
+            os.umask(old_umask)
+
+    def serve_forever(self) -> None:
+        listener = self._listen()
+        threading.Thread(target=self._translate_loop, daemon=True).start()
+        for lane in LANES[1:]:
+            threading.Thread(target=self._lane_loop, args=(lane,), daemon=True).start()
+        with listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, OSError):
+                    continue  # a client with the wrong key must not stop the server
+                threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn) -> None:
+        # One thread per API worker connection; inference is serialized per
+        # model through its lane queue.
+        with conn:
+            while True:
+                try:
+                    target, method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if method == "ping":
+                    # Readiness probe: answered here, never queued behind inference
+                    conn.send(("ok", "pong"))
+                    continue
+                if method not in EXPOSED_METHODS.get(target, ()):
+                    conn.send(("error", f"unknown method {target}.{method}"))
+                    continue
+                jobs = self.lanes[_lane(target, method)]
+                if method in QUALITY_METHODS:
+                    # Overload policy: downgrade based on the depth of this model's queue
+                    try:
+                        kwargs["quality"] = resolve_quality(kwargs.get("quality"), jobs.qsize())
+                    except ValueError as e:
+                        conn.send(("error", repr(e)))
+                        continue
+                job = _Job(target, method, args, kwargs)
+                jobs.put(job)
+                job.done.wait()
+                if job.error is not None:
+                    conn.send(("error", job.error))
+                else:
+                    conn.send(("ok", job.result))
+
+    def _lane_loop(self, lane: str) -> None:
+        jobs = self.lanes[lane]
+        while True:
+            self._run_single(jobs.get())
+
+    def _translate_loop(self) -> None:
+        jobs = self.lanes["translator"]
+        while True:
+            first = jobs.get()
+            batch, deferred = [first], []
+            if self._batchable(first):
+                deadline = time.monotonic() + BATCH_WINDOW_MS / 1000.0
+                while len(batch) < MAX_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        job = jobs.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if self._batchable(job) and self._batch_key(job) == self._batch_key(first):
+                        batch.append(job)
+                    else:
+                        # Don't hold the open batch while an unrelated job runs
+                        deferred.append(job)
+            if len(batch) > 1:
+                self._run_translate_batch(batch)
+            else:
+                self._run_single(first)
+            for job in deferred:
+                self._run_single(job)
+
+    # ------------------- Batching ------------------------------------------
+
+    @staticmethod
+    def _batchable(job: _Job) -> bool:
+        return job.target == "translator" and job.method in ("translate", "translate_batch")
+
+    @staticmethod
+    def _source_language(job: _Job) -> str:
+        if "source_language" in job.kwargs:
+            return job.kwargs["source_language"]
+        return job.args[1] if len(job.args) > 1 else "en"
+
+    @classmethod
+    def _batch_key(cls, job: _Job) -> tuple:
+        return cls._source_language(job), job.kwargs.get("quality")
+
+    @staticmethod
+    def _job_texts(job: _Job) -> List[str]:
+        texts = job.args[0] if job.args else job.kwargs.get("texts", job.kwargs.get("text"))
+        if job.method == "translate":
+            texts = [texts]
+        return [t for t in texts if t and t.strip()]
+
+    def _run_translate_batch(self, batch: List[_Job]) -> None:
+        BATCH_SIZE.labels("model_server").observe(len(batch))
+        per_job = [self._job_texts(job) for job in batch]
+        flat = [t for texts in per_job for t in texts]
+        try:
+            translations = self.targets["translator"].translate_batch(
+                flat, self._source_language(batch[0]), quality=batch[0].kwargs.get("quality")
+            )
+        except Exception as e:
+            for job in batch:
+                job.error = repr(e)
+                job.done.set()
+            return
+
+        pos = 0
+        for job, texts in zip(batch, per_job):
+            chunk = translations[pos:pos + len(texts)]
+            pos += len(texts)
+            if job.method == "translate" and not chunk:
+                # Blank input: let the translator raise exactly as it would locally
+                self._run_single(job)
+                continue
+            job.result = chunk[0] if job.method == "translate" else chunk
+            job.done.set()
+
+    def _run_single(self, job: _Job) -> None:
+        try:
+            job.result = getattr(self.targets[job.target], job.method)(*job.args, **job.kwargs)
+        except Exception as e:
+            job.error = repr(e)
+        job.done.set()
+
+
+# ------------------- Client proxies -------------------------------------
+
+class _RemoteProxy:
+    target = ""
+
+    def __init__(self, address: str = MODEL_SERVER_SOCKET, authkey: Optional[bytes] = None):
+        self.address = address
+        self.authkey = authkey or _authkey()
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        """True if the model server answers within `timeout` seconds."""
+        try:
+            conn = self._conn()
+            conn.send((self.target, "ping", (), {}))
+            if not conn.poll(timeout):
+                raise TimeoutError
+            return conn.recv() == ("ok", "pong")
+        except (EOFError, OSError, AuthenticationError):
+            # Covers a missing socket, a refused/stale connection and a timeout;
+            # the connection is dropped so a late "pong" can't answer the next call
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+            self._local.conn = None
+            return False
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        # Model-side spans are recorded in the server process and never reach
+        # this request's profile; the round trip at least shows where time went
+        with span(f"model_server:{self.target}.{method}"):
+            conn = self._conn()
+            try:
+                conn.send((self.target, method, args, kwargs))
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                # Server restarted; drop the stale connection so the next call reconnects
+                self._local.conn = None
+                raise
+        if status != "ok":
+            raise RemoteError(payload)
+        return payload
+
+
+class RemoteSmartTranslator(_RemoteProxy):
+    target = "translator"
+
+    def translate(self, text: str, source_language: str = "en", quality: Optional[str] = None) -> str:
+        return self._call("translate", text, source_language, quality=quality)
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_language: str = "en",
+        quality: Optional[str] = None,
+    ) -> List[str]:
+        return self._call("translate_batch", list(texts), source_language, quality=quality)
+
+    def translate_english_to_french(self, text: str) -> str:
+        return self._call("translate_english_to_french", text)
+
+    def translate_with_confidence(
+        self,
+        texts: List[str],
+        source_language: str = "en",
+        num_return_sequences: int = 3,
+        num_beams: int = 5,
+        temperature: float = 1.0,
+    ) -> List[List[str]]:
+        return self._call(
+            "translate_with_confidence",
+            list(texts),
+            source_language,
+            num_return_sequences,
+            num_beams,
+            temperature,
+        )
+
+
+class RemotePronunciationChecker(_RemoteProxy):
+    target = "pronunciation_checker"
+
+    def transcribe_speech(self, audio_path: str, language: str = "fr") -> str:
+        return self._call("transcribe_speech", os.path.abspath(audio_path), language)
+
+    def transcribe_audio(self, audio, language: str = "fr", initial_prompt: Optional[str] = None) -> str:
+        return self._call("transcribe_audio", audio, language, initial_prompt)
+
+    def check_pronunciation(self, audio_path: str, expected_text: str) -> dict:
+        return self._call("check_pronunciation", os.path.abspath(audio_path), expected_text)
+
+    def score_transcription(self, expected_text: str, transcribed_text: str) -> dict:
+        return self._call("score_transcription", expected_text, transcribed_text)
+
+    def score_attempts(self, expected_text: str, transcriptions: List[str]) -> List[dict]:
+        return self._call("score_attempts", expected_text, list(transcriptions))
+
+    def similarity_score(self, expected: str, actual: str) -> float:
+        return self._call("similarity_score", expected, actual)
+
+    def generate_feedback(self, expected: str, actual: str, score: float) -> str:
+        return self._call("generate_feedback", expected, actual, score)
+
+    def differences(self, expected: str, actual: str) -> str:
+        return self._call("differences", expected, actual)
+
+    def generate_tts(self, text: str, lang: str = "fr") -> bytes:
+        return self._call("generate_tts", text, lang)
+
+
+class RemoteFrenchConversationBot(_RemoteProxy):
+    target = "conversation_bot"
+
+    def retrieve_relevant_knowledge(self, query: str, k: int = 3):
+        return self._call("retrieve_relevant_knowledge", query, k)
+
+    def generate_response(self, user_input: str, scenario: str = "general", quality: Optional[str] = None) -> str:
+        return self._call("generate_response", user_input, scenario, quality=quality)
+
+
+if __name__ == "__main__":
+    if MODEL_SERVER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(MODEL_SERVER_METRICS_PORT)
+    print(f"Loading models and serving on {MODEL_SERVER_SOCKET} ...")
+    ModelServer().serve_forever()
@@ -1,51 +1,98 @@
 """
 PronunciationChecker:
 - Uses Whisper for speech-to-text
-- Compares transcribed text with expected
-- Provides feedback
+- Compares transcribed text with expected using word-level alignment (alignment.py)
+- Provides per-word feedback
 - Generates TTS audio using gTTS
 """
 
 import whisper
-from difflib import SequenceMatcher
 from gtts import gTTS
+from typing import Dict, List, Optional
 import io
 import os
+import threading
+
+from .alignment import align, align_batch, DELETE, SUBSTITUTE
+from ..metrics import WHISPER_AUDIO_SECONDS, stage_timer
+from ..profiling import span
 
 class PronunciationChecker:
     def __init__(self, model_name: str = "base"):
+        self.model_name = f"whisper-{model_name}"
         self.model = whisper.load_model(model_name)
+        # transcribe() installs KV-cache hooks on the shared decoder, so
+        # overlapping calls from request threads would mix their caches
+        self._transcribe_lock = threading.Lock()
 
     def transcribe_speech(self, audio_path: str, language: str = "fr") -> str:
-        result = self.model.transcribe(audio_path, language=language)
+        with span("transcribe_speech"):
+            with stage_timer(self.model_name, "load_audio"):
+                audio = whisper.load_audio(audio_path)
+            return self.transcribe_audio(audio, language)
+
+    def transcribe_audio(self, audio, language: str = "fr", initial_prompt: Optional[str] = None) -> str:
+        """Transcribe a float32 mono waveform sampled at 16 kHz."""
+        WHISPER_AUDIO_SECONDS.inc(len(audio) / whisper.audio.SAMPLE_RATE)
+        with span("whisper:wait"):
+            self._transcribe_lock.acquire()
+        try:
+            with stage_timer(self.model_name, "transcribe"):
+                result = self.model.transcribe(audio, language=language, initial_prompt=initial_prompt)
+        finally:
+            self._transcribe_lock.release()
         return result["text"]
 
     def check_pronunciation(self, audio_path: str, expected_text: str) -> dict:
         transcribed_text = self.transcribe_speech(audio_path)
-        score = self.similarity_score(expected_text, transcribed_text)
-        feedback = self.generate_feedback(expected_text, transcribed_text, score)
+        return self.score_transcription(expected_text, transcribed_text)
+
+    def score_transcription(self, expected_text: str, transcribed_text: str) -> dict:
+        """Score an already-transcribed attempt (aligned once, reused for feedback)."""
+        with span("similarity_score"):
+            alignment = align(expected_text, transcribed_text)
+        return self._result(expected_text, transcribed_text, alignment)
+
+    def score_attempts(self, expected_text: str, transcriptions: List[str]) -> List[dict]:
+        """Score many transcribed attempts at the same expected text."""
+        with span("similarity_score"):
+            alignments = align_batch(expected_text, transcriptions)
+        return [self._result(expected_text, t, a) for t, a in zip(transcriptions, alignments)]
+
+    def similarity_score(self, expected: str, actual: str) -> float:
+        with span("similarity_score"):
+            return align(expected, actual)["score"]
+
+    def generate_feedback(self, expected: str, actual: str, score: float) -> str:
+        return self._feedback(score, align(expected, actual))
+
+    def differences(self, expected: str, actual: str) -> str:
+        return self._differences(align(expected, actual))
+
+    # ------------------- Internal ----------------------------------------
+
+    def _result(self, expected_text: str, transcribed_text: str, alignment: Dict) -> dict:
         return {
             "expected": expected_text,
             "transcribed": transcribed_text,
-            "similarity_score": score,
-            "feedback": feedback
+            "similarity_score": alignment["score"],
+            "wer": alignment["wer"],
+            "word_alignment": alignment["ops"],
+            "feedback": self._feedback(alignment["score"], alignment),
         }
 
-    def similarity_score(self, expected: str, actual: str) -> float:
-        return SequenceMatcher(None, expected.lower(), actual.lower()).ratio()
-
-    def generate_feedback(self, expected: str, actual: str, score: float) -> str:
+    def _feedback(self, score: float, alignment: Dict) -> str:
         if score > 0.9:
             return "Excellent pronunciation!"
         elif score > 0.7:
-            return f"Good! Check specific words: {self.differences(expected, actual)}"
+            return f"Good! Check specific words: {self._differences(alignment)}"
         else:
-            return f"Keep practicing. Focus on: {self.differences(expected, actual)}"
+            return f"Keep practicing. Focus on: {self._differences(alignment)}"
 
-    def differences(self, expected: str, actual: str) -> str:
-        expected_words = expected.split()
-        actual_words = actual.split()
-        diffs = [w for w, a in zip(expected_words, actual_words) if w != a]
+    @staticmethod
+    def _differences(alignment: Dict) -> str:
+        # Expected words that were misread or skipped, in reading order
+        diffs = [o["expected"] for o in alignment["ops"] if o["op"] in (SUBSTITUTE, DELETE)]
         return ", ".join(diffs) if diffs else "overall pronunciation"
 
     def generate_tts(self, text: str, lang: str = "fr") -> bytes:
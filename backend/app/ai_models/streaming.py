@@ -0,0 +1,169 @@
+"""
+Streaming pronunciation check:
+- SpeechSegmenter: rolling PCM16 buffer split into speech segments by frame energy
+- StreamingPronunciationSession: transcribes each completed segment as it arrives
+  and aligns the running transcript against the expected text
+
+Only the audio after the last completed segment is left to transcribe when the
+learner stops, so the final score arrives shortly after the end of speech.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional
+import os
+
+import numpy as np
+
+from .alignment import align, INSERT, MATCH
+
+WHISPER_SAMPLE_RATE = 16000
+VAD_THRESHOLD = float(os.getenv("STREAM_VAD_THRESHOLD", "0.01"))  # frame RMS, float scale
+SILENCE_MS = int(os.getenv("STREAM_SILENCE_MS", "500"))
+MAX_SEGMENT_S = float(os.getenv("STREAM_MAX_SEGMENT_S", "15"))
+
+
+class SpeechSegmenter:
+    def __init__(
+        self,
+        sample_rate: int = WHISPER_SAMPLE_RATE,
+        frame_ms: int = 30,
+        silence_ms: int = SILENCE_MS,
+        threshold: float = VAD_THRESHOLD,
+        max_segment_s: float = MAX_SEGMENT_S,
+        preroll_ms: int = 150,
+    ):
+        if sample_rate <= 0:
+            raise ValueError(f"sample_rate must be positive, got {sample_rate}")
+        self.sample_rate = sample_rate
+        self.frame = max(1, sample_rate * frame_ms // 1000)
+        self.silence_frames_needed = max(1, silence_ms // frame_ms)
+        self.threshold = threshold
+        self.max_segment = int(max_segment_s * sample_rate)
+        self.preroll = sample_rate * preroll_ms // 1000
+
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.pending = b""           # odd trailing byte of the last chunk (half a sample)
+        self.pos = 0                 # first sample not yet classified
+        self.speech_start: Optional[int] = None
+        self.silent_frames = 0
+
+    def feed(self, pcm: bytes) -> List[np.ndarray]:
+        """Append little-endian PCM16 mono audio; return speech segments that completed.
+
+        Chunks may split a sample: an odd trailing byte is held until the next feed.
+        """
+        if self.pending:
+            pcm = self.pending + pcm
+        split = len(pcm) - len(pcm) % 2
+        self.pending = pcm[split:]
+        samples = np.frombuffer(pcm[:split], dtype="<i2").astype(np.float32) / 32768.0
+        self.buffer = np.concatenate([self.buffer, samples])
+
+        n_frames = (len(self.buffer) - self.pos) // self.frame
+        if n_frames == 0:
+            return []
+        frames = self.buffer[self.pos:self.pos + n_frames * self.frame].reshape(n_frames, self.frame)
+        voiced = np.sqrt(np.mean(frames * frames, axis=1)) >= self.threshold
+
+        completed = []
+        for is_voiced in voiced:
+            frame_start = self.pos
+            self.pos += self.frame
+            if is_voiced:
+                if self.speech_start is None:
+                    self.speech_start = max(0, frame_start - self.preroll)
+                self.silent_frames = 0
+            elif self.speech_start is not None:
+                self.silent_frames += 1
+                if self.silent_frames >= self.silence_frames_needed:
+                    completed.append(self._cut(self.pos - self.silent_frames * self.frame))
+                    continue
+            if self.speech_start is not None and self.pos - self.speech_start >= self.max_segment:
+                completed.append(self._cut(self.pos))
+                # Keep listening: the learner is still mid-utterance
+                self.speech_start = self.pos
+
+        self._compact()
+        return [self._to_whisper_rate(seg) for seg in completed if len(seg)]
+
+    def flush(self) -> Optional[np.ndarray]:
+        """Return whatever speech is still buffered (called when the learner stops)."""
+        if self.speech_start is None:
+            return None
+        seg = self.buffer[self.speech_start:]
+        self.speech_start = None
+        self.silent_frames = 0
+        return self._to_whisper_rate(seg) if len(seg) else None
+
+    def _cut(self, end: int) -> np.ndarray:
+        seg = self.buffer[self.speech_start:end].copy()
+        self.speech_start = None
+        self.silent_frames = 0
+        return seg
+
+    def _compact(self) -> None:
+        # Drop audio that can no longer be part of a segment, keeping the pre-roll
+        keep_from = self.speech_start if self.speech_start is not None else max(0, self.pos - self.preroll)
+        if keep_from > 0:
+            self.buffer = self.buffer[keep_from:]
+            self.pos -= keep_from
+            if self.speech_start is not None:
+                self.speech_start -= keep_from
+
+    def _to_whisper_rate(self, audio: np.ndarray) -> np.ndarray:
+        if self.sample_rate == WHISPER_SAMPLE_RATE:
+            return audio
+        n_out = int(len(audio) * WHISPER_SAMPLE_RATE / self.sample_rate)
+        x_old = np.linspace(0.0, 1.0, num=len(audio), endpoint=False)
+        x_new = np.linspace(0.0, 1.0, num=n_out, endpoint=False)
+        return np.interp(x_new, x_old, audio).astype(np.float32)
+
+
+class StreamingPronunciationSession:
+    def __init__(self, checker, expected_text: str, sample_rate: int = WHISPER_SAMPLE_RATE, language: str = "fr"):
+        self.checker = checker
+        self.expected_text = expected_text
+        self.language = language
+        self.segmenter = SpeechSegmenter(sample_rate=sample_rate)
+        self.segments: List[str] = []
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(s for s in self.segments if s)
+
+    def feed(self, pcm: bytes) -> List[np.ndarray]:
+        return self.segmenter.feed(pcm)
+
+    def add_segment(self, audio: np.ndarray) -> Dict:
+        """Transcribe one completed segment and return partial feedback (blocking)."""
+        # Previous text as the prompt keeps Whisper consistent across segment boundaries
+        text = self.checker.transcribe_audio(audio, self.language, initial_prompt=self.transcript or None)
+        self.segments.append(text.strip())
+        return self.partial_result()
+
+    def partial_result(self) -> Dict:
+        alignment = align(self.expected_text, self.transcript)
+        # Expected words after the last transcribed word haven't been read yet
+        ops = alignment["ops"]
+        last_read = max((i for i, o in enumerate(ops) if o["actual"] is not None), default=-1)
+        read_ops = ops[:last_read + 1]
+        expected_read = sum(1 for o in read_ops if o["op"] != INSERT)
+        errors = sum(1 for o in read_ops if o["op"] != MATCH)
+        score = max(0.0, 1.0 - errors / expected_read) if expected_read else 0.0
+        return {
+            "type": "partial",
+            "transcribed": self.transcript,
+            "words_read": expected_read,
+            "words_total": expected_read + len(ops) - len(read_ops),
+            "similarity_score": score,
+            "word_alignment": read_ops,
+        }
+
+    def finish(self) -> Dict:
+        """Transcribe the remaining buffered speech and return the final score (blocking)."""
+        tail = self.segmenter.flush()
+        if tail is not None:
+            text = self.checker.transcribe_audio(tail, self.language, initial_prompt=self.transcript or None)
+            self.segments.append(text.strip())
+        result = self.checker.score_transcription(self.expected_text, self.transcript)
+        return {"type": "final", **result}
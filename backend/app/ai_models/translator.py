@@ -4,6 +4,8 @@ Supports:
 - EN -> FR
 - TA -> FR (direct if available, fallback: TA -> EN -> FR)
 - Batch translation and n-best candidates
+- Quality modes (fast/balanced/best), see decoding.py
+- EN -> FR translation memory from the prebuilt vocabulary store (app/vocab_store.py)
 """
 
 from __future__ import annotations
@@ -12,6 +14,10 @@ import os
 import torch
 from transformers import MarianMTModel, MarianTokenizer
 
+from .decoding import resolve_quality, generation_kwargs, apply_thread_budget
+from ..metrics import BATCH_SIZE, CACHE_REQUESTS, stage_timer
+from ..vocab_store import get_vocab_store
+
 def _get_device() -> torch.device:
     return torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
 
@@ -24,6 +30,7 @@ class SmartTranslator:
         device: Optional[torch.device] = None,
     ):
         self.device = device or _get_device()
+        self.vocab_store = get_vocab_store()
 
         # EN → FR
         self.en_fr_tokenizer = MarianTokenizer.from_pretrained(en_fr_model)
@@ -55,30 +62,36 @@ class SmartTranslator:
 
     # ------------------- Public API --------------------------------------
 
-    def translate(self, text: str, source_language: str = "en") -> str:
-        return self.translate_batch([text], source_language)[0]
+    def translate(self, text: str, source_language: str = "en", quality: Optional[str] = None) -> str:
+        return self.translate_batch([text], source_language, quality)[0]
 
-    def translate_batch(self, texts: List[str], source_language: str = "en") -> List[str]:
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_language: str = "en",
+        quality: Optional[str] = None,
+    ) -> List[str]:
         texts = [t for t in texts if t and t.strip()]
         if not texts:
             return []
 
+        quality = resolve_quality(quality)
         src = source_language.lower()
         if src.startswith("en"):
-            return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, texts)
+            return self._translate_en_fr(texts, quality)
         elif src.startswith("fr"):
-            return self._translate_with(self.fr_en_tokenizer, self.fr_en_model, texts)
+            return self._translate_with(self.fr_en_tokenizer, self.fr_en_model, texts, quality)
         elif src.startswith("ta"):
             # Direct TA→FR if available
             if self.ta_fr_model and self.ta_fr_tokenizer:
-                return self._translate_with(self.ta_fr_tokenizer, self.ta_fr_model, texts)
+                return self._translate_with(self.ta_fr_tokenizer, self.ta_fr_model, texts, quality)
             # Fallback: TA → EN → FR
             if self.ta_en_model and self.ta_en_tokenizer:
-                en_texts = self._translate_with(self.ta_en_tokenizer, self.ta_en_model, texts)
-                return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, en_texts)
+                en_texts = self._translate_with(self.ta_en_tokenizer, self.ta_en_model, texts, quality)
+                return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, en_texts, quality)
             return [f"[no-ta-fr-model] {t}" for t in texts]
         else:
-            return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, texts)
+            return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, texts, quality)
 
     # Convenience wrapper for quick tests
     def translate_english_to_french(self, text: str) -> str:
@@ -133,8 +146,43 @@ class SmartTranslator:
 
     # ------------------- Internal ----------------------------------------
 
-    def _translate_with(self, tok: MarianTokenizer, model: MarianMTModel, batch: List[str]) -> List[str]:
-        inputs = tok(batch, return_tensors="pt", padding=True, truncation=True).to(self.device)
-        with torch.no_grad():
-            gen = model.generate(**inputs, max_new_tokens=128, num_beams=4, early_stopping=True)
-        return [tok.decode(g, skip_special_tokens=True) for g in gen]
+    def _translate_en_fr(self, texts: List[str], quality: str) -> List[str]:
+        """EN -> FR, serving known vocabulary from the store and only misses from the model.
+
+        Hits keep the input's capitalization and punctuation. The store is a
+        snapshot from the last build_vocab_store.py run, loaded once per
+        process: words edited in the database keep their old translation until
+        the store is rebuilt and the workers restart.
+        """
+        if self.vocab_store is None:
+            return self._translate_with(self.en_fr_tokenizer, self.en_fr_model, texts, quality)
+        results = [self.vocab_store.french_for(t) for t in texts]
+        misses = [i for i, r in enumerate(results) if r is None]
+        CACHE_REQUESTS.labels("vocab_store", "hit").inc(len(texts) - len(misses))
+        CACHE_REQUESTS.labels("vocab_store", "miss").inc(len(misses))
+        if misses:
+            translated = self._translate_with(
+                self.en_fr_tokenizer, self.en_fr_model, [texts[i] for i in misses], quality
+            )
+            for i, t in zip(misses, translated):
+                results[i] = t
+        return results
+
+    def _translate_with(
+        self,
+        tok: MarianTokenizer,
+        model: MarianMTModel,
+        batch: List[str],
+        quality: str = "best",
+    ) -> List[str]:
+        name = model.name_or_path
+        BATCH_SIZE.labels(name).observe(len(batch))
+        with stage_timer(name, "tokenize"):
+            inputs = tok(batch, return_tensors="pt", padding=True, truncation=True).to(self.device)
+        # Budget output length from the longest input in the batch (padded length)
+        gen_kwargs = generation_kwargs(quality, inputs["input_ids"].shape[1], max_cap=128, num_beams=4)
+        apply_thread_budget(self.device)
+        with stage_timer(name, "generate"), torch.no_grad():
+            gen = model.generate(**inputs, **gen_kwargs)
+        with stage_timer(name, "decode"):
+            return [tok.decode(g, skip_special_tokens=True) for g in gen]
@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
 from . import models
+from .metrics import CACHE_REQUESTS
+from .profiling import span
 
 # Load environment variables
 load_dotenv()
@@ -24,13 +26,18 @@ def get_vocab_cached(db: Session, word_id: int) -> Optional[Dict[str, Any]]:
     Cached value: JSON with a subset of columns.
     """
     key = f"vocab:{word_id}"
-    cached = r.get(key)
+    with span("cache:redis get"):
+        cached = r.get(key)
     if cached:
         try:
-            return json.loads(cached)
+            data = json.loads(cached)
+            CACHE_REQUESTS.labels("redis", "hit").inc()
+            return data
         except Exception:
             # If cache is corrupted, ignore and rebuild
-            pass
+            CACHE_REQUESTS.labels("redis", "error").inc()
+    else:
+        CACHE_REQUESTS.labels("redis", "miss").inc()
 
     v = (
         db.query(models.Vocabulary)
@@ -50,7 +57,8 @@ def get_vocab_cached(db: Session, word_id: int) -> Optional[Dict[str, Any]]:
     }
 
     # Cache for 1 hour
-    r.set(key, json.dumps(data), ex=3600)
+    with span("cache:redis set"):
+        r.set(key, json.dumps(data), ex=3600)
     return data
 
 
@@ -0,0 +1,124 @@
+# backend/app/metrics.py
+"""Prometheus metrics for routes, model inference, caching and the DB pool.
+
+Exposed by main.py at GET /metrics. With several uvicorn workers, set
+PROMETHEUS_MULTIPROC_DIR to a shared empty directory so every worker's
+samples are aggregated.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from .profiling import span
+
+# Inference stages range from sub-millisecond decodes to multi-second generations
+INFERENCE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+INFERENCE_SECONDS = Histogram(
+    "model_inference_seconds",
+    "Model inference time split by stage (tokenize/generate/decode/encode/search/transcribe)",
+    ["model", "stage"],
+    buckets=INFERENCE_BUCKETS,
+)
+BATCH_SIZE = Histogram(
+    "model_batch_size",
+    "Number of inputs per model call",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by tier and result (hit/miss/error)",
+    ["tier", "result"],
+)
+WHISPER_AUDIO_SECONDS = Counter(
+    "whisper_audio_seconds_total",
+    "Seconds of audio transcribed by Whisper",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+
+
+class stage_timer:
+    """Context manager observing INFERENCE_SECONDS{model, stage}.
+
+    Also records a profiling span when the current request is being profiled.
+    """
+
+    __slots__ = ("child", "start", "span")
+
+    def __init__(self, model: str, stage: str):
+        self.child = INFERENCE_SECONDS.labels(model, stage)
+        self.span = span(f"{stage} [{model}]")
+
+    def __enter__(self):
+        self.span.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        self.span.__exit__(*exc)
+        return False
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times connection checkouts.
+
+    Pass as create_engine(..., poolclass=InstrumentedQueuePool); unlike
+    patching a pool instance, this survives engine.dispose(), whose
+    pool.recreate() builds a new pool of the same class.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            with span("db:pool checkout"):
+                return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_pool(engine) -> None:
+    """Track checked-out connections for `engine` (checkout wait: InstrumentedQueuePool)."""
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def render_latest():
+    """Return (body, content_type) for the /metrics endpoint."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,150 @@
+# backend/app/profiling.py
+"""Opt-in per-request span profiling with slow-request capture.
+
+A request is profiled when it carries `X-Profile: <PROFILE_ADMIN_TOKEN>`, is
+picked by PROFILE_SAMPLE_RATE, or PROFILE_SLOW_MS is set (then every request
+records spans, which are only kept if the request turns out slow).
+
+Profiles are written to PROFILE_DIR as folded stacks (`a;b;c <microseconds>`,
+readable by flamegraph.pl and speedscope) plus a JSON span tree. The directory
+is a ring buffer holding at most PROFILE_RING_SIZE profiles.
+"""
+import json
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))  # 0 = no slow capture
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_RING_SIZE = int(os.getenv("PROFILE_RING_SIZE", "200"))
+
+_current: ContextVar[Optional["Span"]] = ContextVar("profile_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "ms": round(self.duration * 1000.0, 3),
+            "children": [c.to_dict() for c in self.children],
+        }
+
+    def folded(self, prefix: str = "") -> List[str]:
+        """Folded-stack lines; each frame's weight is its self time in microseconds."""
+        frame = self.name.replace(";", ",")
+        path = f"{prefix};{frame}" if prefix else frame
+        child_time = sum(c.duration for c in self.children)
+        self_us = max(0, int((self.duration - child_time) * 1_000_000))
+        lines = [f"{path} {self_us}"] if self_us else []
+        for child in self.children:
+            lines.extend(child.folded(path))
+        return lines
+
+
+class span:
+    """Record a child span of the active profile; a no-op when nothing is being profiled."""
+
+    __slots__ = ("name", "node", "token")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.node = None
+
+    def __enter__(self):
+        parent = _current.get()
+        if parent is not None:
+            self.node = Span(self.name)
+            parent.children.append(self.node)
+            self.token = _current.set(self.node)
+        return self
+
+    def __exit__(self, *exc):
+        if self.node is not None:
+            self.node.end = time.perf_counter()
+            _current.reset(self.token)
+        return False
+
+
+def should_profile(profile_header: Optional[str]) -> bool:
+    if PROFILE_ADMIN_TOKEN and profile_header == PROFILE_ADMIN_TOKEN:
+        return True
+    if PROFILE_SLOW_MS > 0:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def start_profile(name: str):
+    """Begin a root span for the current request; returns (root, token)."""
+    root = Span(name)
+    return root, _current.set(root)
+
+
+def finish_profile(root: Span, token) -> float:
+    root.end = time.perf_counter()
+    _current.reset(token)
+    return root.duration * 1000.0
+
+
+def is_slow(duration_ms: float) -> bool:
+    return PROFILE_SLOW_MS > 0 and duration_ms >= PROFILE_SLOW_MS
+
+
+def write_profile(root: Span, meta: Dict) -> str:
+    """Persist a profile into the ring buffer and return its id."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    # Time-ordered, unique across workers
+    profile_id = f"{time.time_ns()}-{os.getpid()}"
+    base = os.path.join(PROFILE_DIR, profile_id)
+    with open(base + ".folded", "w") as f:
+        f.write("\n".join(root.folded()) + "\n")
+    with open(base + ".json", "w") as f:
+        json.dump({**meta, "id": profile_id, "tree": root.to_dict()}, f, indent=2)
+    _prune()
+    return profile_id
+
+
+def _prune() -> None:
+    try:
+        ids = sorted({name.rsplit(".", 1)[0] for name in os.listdir(PROFILE_DIR)})
+    except FileNotFoundError:
+        return
+    for old in ids[:-PROFILE_RING_SIZE] if PROFILE_RING_SIZE > 0 else ids:
+        for ext in (".folded", ".json"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, old + ext))
+            except FileNotFoundError:
+                pass
+
+
+def instrument_engine(engine) -> None:
+    """Record a span around every SQL statement executed through `engine`."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            verb = statement.split(None, 1)[0].upper() if statement else "SQL"
+            context._profile_span = span(f"db:{verb}").__enter__()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        s = getattr(context, "_profile_span", None)
+        if s is not None:
+            s.__exit__(None, None, None)
+            context._profile_span = None
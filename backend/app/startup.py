@@ -0,0 +1,191 @@
+# backend/app/startup.py
+"""Background model loading with a per-component startup report.
+
+Heavy libraries (torch, transformers, whisper, sentence_transformers, faiss,
+gTTS) are only imported on a background thread, so the API can serve routes
+that don't need a model while the models load. Imports run one at a time
+(concurrent imports of the same package serialize on its import lock, so
+per-thread timings would double-count), starting with the libraries every
+family shares; only the from_pretrained/load_model work runs in parallel.
+
+MODEL_BACKEND selects what gets loaded: "local" (default), "server" (thin
+proxies to app.ai_models.model_server) or "stub" (deterministic fakes).
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING, LOADING, READY, FAILED = "pending", "loading", "ready", "failed"
+
+# Imported once up front for the local backend and reported as shared_import_s
+SHARED_IMPORTS = ("torch", "transformers")
+
+
+def _backend() -> str:
+    # USE_STUB_MODELS / USE_MODEL_SERVER are still honoured for existing deployments
+    if os.getenv("USE_STUB_MODELS", "0") == "1":
+        return "stub"
+    if os.getenv("USE_MODEL_SERVER", "0") == "1":
+        return "server"
+    return os.getenv("MODEL_BACKEND", "local")
+
+
+def _import_class(backend: str, name: str):
+    if backend == "stub":
+        from .ai_models import stubs
+
+        return getattr(stubs, {
+            "translator": "StubTranslator",
+            "pronunciation_checker": "StubPronunciationChecker",
+            "conversation_bot": "StubFrenchConversationBot",
+        }[name])
+    if backend == "server":
+        from .ai_models import model_server
+
+        return getattr(model_server, {
+            "translator": "RemoteSmartTranslator",
+            "pronunciation_checker": "RemotePronunciationChecker",
+            "conversation_bot": "RemoteFrenchConversationBot",
+        }[name])
+    if name == "translator":
+        from .ai_models.translator import SmartTranslator
+
+        return SmartTranslator
+    if name == "pronunciation_checker":
+        from .ai_models.pronunciation_checker import PronunciationChecker
+
+        return PronunciationChecker
+    if name == "conversation_bot":
+        from .ai_models.conversation_bot import FrenchConversationBot
+
+        return FrenchConversationBot
+    raise KeyError(name)
+
+
+COMPONENTS = ("translator", "pronunciation_checker", "conversation_bot")
+
+
+class ModelRegistry:
+    def __init__(self, backend: Optional[str] = None, components: Tuple[str, ...] = COMPONENTS):
+        self.backend = backend or _backend()
+        self.components = components
+        self._instances: Dict[str, Any] = {}
+        self._status: Dict[str, Dict[str, Any]] = {name: {"status": PENDING} for name in components}
+        self._events = {name: threading.Event() for name in components}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._shared_import_s: Optional[float] = None
+
+    def start(self) -> None:
+        """Begin loading every component in the background; returns immediately."""
+        if self._thread is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.components), thread_name_prefix="model-load")
+        self._thread = threading.Thread(target=self._import_all, name="model-import", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _import_all(self) -> None:
+        if self.backend == "local":
+            t0 = time.perf_counter()
+            for module in SHARED_IMPORTS:
+                try:
+                    __import__(module)
+                except ImportError:
+                    # The component that needs it reports the failure
+                    logger.warning("Shared import %s failed", module)
+            self._shared_import_s = round(time.perf_counter() - t0, 3)
+
+        for name in self.components:
+            status = self._status[name]
+            status["status"] = LOADING
+            try:
+                t0 = time.perf_counter()
+                cls = _import_class(self.backend, name)
+                status["import_s"] = round(time.perf_counter() - t0, 3)
+            except Exception as e:
+                self._fail(name, e)
+                continue
+            try:
+                self._executor.submit(self._load, name, cls)
+            except RuntimeError as e:  # shut down while still importing
+                self._fail(name, e)
+
+    def _load(self, name: str, cls) -> None:
+        status = self._status[name]
+        try:
+            t0 = time.perf_counter()
+            instance = cls()
+            t1 = time.perf_counter()
+            self._instances[name] = instance
+            status.update(status=READY, load_s=round(t1 - t0, 3), ready_after_s=round(t1 - self._started_at, 3))
+            logger.info("%s ready: import %.2fs, load %.2fs", name, status["import_s"], t1 - t0)
+        except Exception as e:
+            self._fail(name, e)
+        else:
+            self._events[name].set()
+
+    def _fail(self, name: str, error: Exception) -> None:
+        self._status[name].update(status=FAILED, error=repr(error))
+        logger.error("Failed to load %s", name, exc_info=error)
+        self._events[name].set()
+
+    def get(self, name: str, timeout: Optional[float] = 0) -> Any:
+        """Return a loaded component, or None if it isn't ready (optionally waiting `timeout` s)."""
+        if name not in self._instances and timeout != 0:
+            self._events[name].wait(timeout)
+        return self._instances.get(name)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every component has finished loading (or failed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in self._events.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not event.wait(remaining):
+                return False
+        return True
+
+    def status(self, name: str) -> str:
+        return self._status[name]["status"]
+
+    @property
+    def ready(self) -> bool:
+        return all(s["status"] == READY for s in self._status.values())
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "ready": self.ready,
+            "shared_import_s": self._shared_import_s,
+            "components": self._status,
+        }
+
+    def check(self) -> Dict[str, Any]:
+        """report(), where "ready" also requires the model server to answer a ping (blocking)."""
+        report = self.report()
+        if report["ready"] and self.backend == "server":
+            reachable = all(instance.ping() for instance in self._instances.values())
+            report.update(ready=reachable, server_reachable=reachable)
+        return report
+
+
+def build_instances(backend: str = "local") -> Dict[str, Any]:
+    """Load every component in parallel and block until done (for scripts / the model server)."""
+    registry = ModelRegistry(backend)
+    registry.start()
+    registry.wait()
+    registry.shutdown()
+    failed = {n: s["error"] for n, s in registry.report()["components"].items() if s["status"] == FAILED}
+    if failed:
+        raise RuntimeError(f"failed to load: {failed}")
+    return {name: registry.get(name) for name in registry.components}
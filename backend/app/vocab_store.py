@@ -0,0 +1,207 @@
+# backend/app/vocab_store.py
+"""Columnar, memory-mapped vocabulary artifact.
+
+Built by build_vocab_store.py from models.Vocabulary. Each column is a .npy
+file so services can np.load(..., mmap_mode="r") it at startup instead of
+re-normalizing and re-embedding the same words:
+
+    manifest.json                 version (content hash), models, row count
+    ids.npy                       int64 vocabulary ids
+    <col>.data.npy/.offsets.npy   UTF-8 strings (english, french, en_norm, fr_norm),
+                                  stored as one flat buffer plus row offsets
+    en_emb.npy / fr_emb.npy       float16 MiniLM embeddings, one row per word
+
+A `delta/` subdirectory with the same layout holds rows added since the base
+build; it is only applied when its base_version matches the base manifest.
+"""
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .ai_models.alignment import normalize
+
+VOCAB_STORE_DIR = os.getenv("VOCAB_STORE_DIR", "vocab_store")
+
+STRING_COLUMNS = ("english", "french", "en_norm", "fr_norm")
+EMBEDDING_COLUMNS = ("en_emb", "fr_emb")
+
+# Leading punctuation, the words, trailing punctuation
+_EDGES = re.compile(r"^(\W*)(.*?)(\W*)$", re.S)
+
+
+def content_hash(rows: Iterable[Dict]) -> str:
+    """Stable hash of (id, english, french) over rows sorted by id."""
+    h = hashlib.sha256()
+    for row in sorted(rows, key=lambda r: r["id"]):
+        h.update(f"{row['id']}\t{row['english_word']}\t{row['french_word']}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# ------------------- Writing ------------------------------------------
+
+def build_columns(rows: Sequence[Dict], embedder=None) -> Dict[str, object]:
+    """Compute every column for `rows` (dicts with id/english_word/french_word)."""
+    english = [r["english_word"] for r in rows]
+    french = [r["french_word"] for r in rows]
+    columns: Dict[str, object] = {
+        "ids": np.array([r["id"] for r in rows], dtype=np.int64),
+        "english": english,
+        "french": french,
+        "en_norm": [normalize(w) for w in english],
+        "fr_norm": [normalize(w) for w in french],
+    }
+    if embedder is not None and rows:
+        columns["en_emb"] = np.asarray(embedder.encode(english, batch_size=256), dtype=np.float16)
+        columns["fr_emb"] = np.asarray(embedder.encode(french, batch_size=256), dtype=np.float16)
+    return columns
+
+
+def _write_ragged(path: str, name: str, values: List, dtype) -> None:
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    data = np.fromiter((x for v in values for x in v), dtype=dtype, count=int(offsets[-1]))
+    np.save(os.path.join(path, f"{name}.data.npy"), data)
+    np.save(os.path.join(path, f"{name}.offsets.npy"), offsets)
+
+
+def write_store(path: str, columns: Dict[str, object], manifest: Dict) -> None:
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "ids.npy"), columns["ids"])
+    for name in STRING_COLUMNS:
+        _write_ragged(path, name, [s.encode("utf-8") for s in columns[name]], np.uint8)
+    for name in EMBEDDING_COLUMNS:
+        if name in columns:
+            np.save(os.path.join(path, f"{name}.npy"), columns[name])
+    # Manifest last, so a half-written store is never picked up
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump({**manifest, "rows": int(len(columns["ids"]))}, f, indent=2)
+
+
+# ------------------- Reading ------------------------------------------
+
+class _Ragged:
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def string(self, i: int) -> str:
+        return bytes(self[i]).decode("utf-8")
+
+
+class _Segment:
+    """One on-disk store (base or delta), memory-mapped."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        load = lambda name: np.load(os.path.join(path, name), mmap_mode="r")
+        self.ids = load("ids.npy")
+        self.columns: Dict[str, object] = {}
+        for name in STRING_COLUMNS:
+            self.columns[name] = _Ragged(load(f"{name}.data.npy"), load(f"{name}.offsets.npy"))
+        for name in EMBEDDING_COLUMNS:
+            if os.path.exists(os.path.join(path, f"{name}.npy")):
+                self.columns[name] = load(f"{name}.npy")
+
+
+class VocabStore:
+    def __init__(self, path: str = VOCAB_STORE_DIR):
+        self.path = path
+        self.segments = [_Segment(path)]
+        delta_path = os.path.join(path, "delta")
+        if os.path.exists(os.path.join(delta_path, "manifest.json")):
+            delta = _Segment(delta_path)
+            if delta.manifest.get("base_version") == self.version:
+                self.segments.append(delta)
+
+        # Row lookup tables (the only part built in memory): id / normalized word -> (segment, row)
+        self._by_id: Dict[int, tuple] = {}
+        self._by_en_norm: Dict[str, tuple] = {}
+        for s, seg in enumerate(self.segments):
+            en_norm = seg.columns["en_norm"]
+            for row, word_id in enumerate(seg.ids.tolist()):
+                self._by_id[word_id] = (s, row)
+                self._by_en_norm.setdefault(en_norm.string(row), (s, row))
+
+    @property
+    def manifest(self) -> Dict:
+        return self.segments[0].manifest
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def has(self, column: str) -> bool:
+        return all(column in seg.columns or len(seg.ids) == 0 for seg in self.segments)
+
+    def _get(self, loc: tuple, column: str):
+        seg, row = self.segments[loc[0]], loc[1]
+        value = seg.columns[column]
+        if column in STRING_COLUMNS:
+            return value.string(row)
+        return value[row]
+
+    def row(self, word_id: int) -> Optional[Dict]:
+        loc = self._by_id.get(word_id)
+        if loc is None:
+            return None
+        return {"id": word_id, **{c: self._get(loc, c) for c in STRING_COLUMNS}}
+
+    def french_for(self, english_text: str) -> Optional[str]:
+        """Translation-memory lookup by normalized English word/phrase.
+
+        The match ignores case and punctuation, so the stored French is given
+        the input's capitalization and surrounding punctuation:
+        "Goodbye!" -> "Au revoir!".
+        """
+        loc = self._by_en_norm.get(normalize(english_text))
+        if loc is None:
+            return None
+        return match_surface(english_text, self._get(loc, "french"))
+
+    def embeddings(self, column: str = "en_emb") -> np.ndarray:
+        """All embeddings for `column` as float32, base rows followed by delta rows."""
+        return np.concatenate([
+            np.asarray(seg.columns[column], dtype=np.float32) for seg in self.segments if len(seg.ids)
+        ])
+
+    def strings(self, column: str) -> List[str]:
+        """All values of a string column in the same order as embeddings()."""
+        return [seg.columns[column].string(i) for seg in self.segments for i in range(len(seg.ids))]
+
+
+def match_surface(source: str, target: str) -> str:
+    """Copy `source`'s capitalization and outer punctuation onto `target`."""
+    lead, core, trail = _EDGES.match(source.strip()).groups()
+    t_lead, t_core, t_trail = _EDGES.match(target.strip()).groups()
+    if len(core) > 1 and core.isupper():
+        t_core = t_core.upper()
+    elif core[:1].isupper():
+        t_core = t_core[:1].upper() + t_core[1:]
+    return (lead or t_lead) + t_core + (trail or t_trail)
+
+
+@lru_cache(maxsize=1)
+def get_vocab_store() -> Optional[VocabStore]:
+    """The process-wide store, or None if VOCAB_STORE_DIR hasn't been built.
+
+    Loaded once per process: rebuilding the store takes effect on restart.
+    """
+    if not os.path.exists(os.path.join(VOCAB_STORE_DIR, "manifest.json")):
+        return None
+    return VocabStore(VOCAB_STORE_DIR)
@@ -0,0 +1,292 @@
+"""
+Endpoint benchmark suite for main.py
+
+- Drives every endpoint in-process (httpx ASGI transport, no network)
+- Sequential pass plus a concurrent pass per endpoint
+- Stub models (deterministic, fast) or the real models
+- SQLite instead of Postgres, fakeredis instead of Redis
+- Reports throughput and p50/p95/p99 latency to a JSON file
+- Optional comparison against a baseline JSON to catch regressions
+
+Usage (from backend/):
+    python -m benchmarks.bench_endpoints --stub --out bench.json
+    python -m benchmarks.bench_endpoints --stub --out new.json --baseline bench.json
+    python -m benchmarks.bench_endpoints --real --requests 20 --concurrency 4
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import wave
+
+# Metrics compared against the baseline; higher latency / lower throughput is a regression
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an unsorted list (pct in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lo, hi = math.floor(rank), math.ceil(rank)
+    if lo == hi:
+        return ordered[lo]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def summarize(latencies_s: List[float], errors: int, wall_s: float) -> Dict[str, Any]:
+    ms = [x * 1000.0 for x in latencies_s]
+    return {
+        "requests": len(ms) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(ms) / wall_s, 2) if wall_s > 0 else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+# ------------------- Environment --------------------------------------
+
+def configure_environment(stub: bool, db_path: str, stub_latency_ms: float) -> None:
+    """Must run before main.py is imported: it reads these at import time."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["USE_STUB_MODELS"] = "1" if stub else "0"
+    os.environ["STUB_LATENCY_MS"] = str(stub_latency_ms)
+
+
+def load_app(vocab_rows: int):
+    import fakeredis
+
+    from app import cache, models
+    from app.database import Base, SessionLocal, engine
+
+    cache.r = fakeredis.FakeRedis()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(models.Vocabulary).count() == 0:
+            db.add_all(
+                models.Vocabulary(
+                    english_word=f"word{i}",
+                    french_word=f"mot{i}",
+                    pronunciation=f"mo{i}",
+                    category="bench",
+                )
+                for i in range(vocab_rows)
+            )
+            db.commit()
+    finally:
+        db.close()
+
+    import main
+
+    # The ASGI transport doesn't run lifespan events; load the models up front
+    main.model_registry.start()
+    main.model_registry.wait()
+    print(f"Startup: {json.dumps(main.model_registry.report())}")
+    return main.app
+
+
+def make_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    """A short 440 Hz tone so the real Whisper path has something to decode."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        frames = bytearray()
+        for n in range(int(seconds * rate)):
+            sample = int(8000 * math.sin(2 * math.pi * 440 * n / rate))
+            frames += sample.to_bytes(2, "little", signed=True)
+        w.writeframes(bytes(frames))
+    return buf.getvalue()
+
+
+# ------------------- Scenarios ----------------------------------------
+
+def build_scenarios(vocab_rows: int) -> Dict[str, Callable]:
+    wav = make_wav()
+    counter = {"n": 0}
+
+    def next_id() -> int:
+        counter["n"] += 1
+        return counter["n"]
+
+    return {
+        "POST /translate": lambda c: c.post(
+            "/translate", json={"text": "I would like a coffee, please.", "source_language": "en"}
+        ),
+        "POST /translate-batch": lambda c: c.post(
+            "/translate-batch", json={"text": "Where is the train station?", "source_language": "en"}
+        ),
+        "POST /check-pronunciation": lambda c: c.post(
+            "/check-pronunciation",
+            params={"expected_text": "bonjour je voudrais un café"},
+            # Fixed name, like browser recorders send; uploads must not collide
+            files={"audio": ("recording.wav", wav, "audio/wav")},
+        ),
+        "POST /tts": lambda c: c.post("/tts", params={"text": "Bonjour tout le monde"}),
+        "POST /conversation": lambda c: c.post(
+            "/conversation", json={"message": "How do I order coffee?", "scenario": "cafe"}
+        ),
+        "GET /vocab": lambda c: c.get("/vocab", params={"limit": 50}),
+        "GET /vocab/{id}": lambda c: c.get(f"/vocab/{(next_id() % vocab_rows) + 1}"),
+        "POST /vocab": lambda c: c.post(
+            "/vocab", json={"english_word": "bench", "french_word": f"banc{next_id()}"}
+        ),
+        "GET /": lambda c: c.get("/"),
+    }
+
+
+async def _timed(client, call) -> Optional[float]:
+    start = time.perf_counter()
+    resp = await call(client)
+    elapsed = time.perf_counter() - start
+    return elapsed if resp.status_code < 400 else None
+
+
+async def run_sequential(client, call, n: int) -> Dict[str, Any]:
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(n):
+        t = await _timed(client, call)
+        if t is None:
+            errors += 1
+        else:
+            latencies.append(t)
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_concurrent(client, call, n: int, concurrency: int) -> Dict[str, Any]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            return await _timed(client, call)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(n)))
+    wall = time.perf_counter() - start
+    latencies = [r for r in results if r is not None]
+    return summarize(latencies, len(results) - len(latencies), wall)
+
+
+async def run_suite(app, scenarios, n: int, concurrency: int, warmup: int, only: Optional[List[str]]):
+    import httpx
+
+    results: Dict[str, Dict[str, Any]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, call in scenarios.items():
+            if only and not any(o in name for o in only):
+                continue
+            for _ in range(warmup):
+                await call(client)
+            results[name] = {
+                "sequential": await run_sequential(client, call, n),
+                "concurrent": await run_concurrent(client, call, n, concurrency),
+            }
+            seq, conc = results[name]["sequential"], results[name]["concurrent"]
+            print(
+                f"{name:28s} seq p50={seq['p50_ms']:9.2f}ms p99={seq['p99_ms']:9.2f}ms "
+                f"| x{concurrency} p50={conc['p50_ms']:9.2f}ms p99={conc['p99_ms']:9.2f}ms "
+                f"{conc['throughput_rps']:8.1f} rps  errors={seq['errors'] + conc['errors']}"
+            )
+    return results
+
+
+# ------------------- Baseline comparison ------------------------------
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """List human-readable regressions beyond `tolerance` (0.2 == 20%)."""
+    regressions = []
+    for name, modes in current["results"].items():
+        base_modes = baseline.get("results", {}).get(name)
+        if not base_modes:
+            continue
+        for mode, stats in modes.items():
+            base = base_modes.get(mode)
+            if not base:
+                continue
+            for key in LATENCY_KEYS:
+                if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                    regressions.append(f"{name} [{mode}] {key}: {base[key]} -> {stats[key]}")
+            if base["throughput_rps"] > 0 and stats["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{name} [{mode}] throughput_rps: {base['throughput_rps']} -> {stats['throughput_rps']}"
+                )
+            if stats["errors"] > base["errors"]:
+                regressions.append(f"{name} [{mode}] errors: {base['errors']} -> {stats['errors']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the API endpoints in-process.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stub", dest="stub", action="store_true", default=True, help="use stub models (default)")
+    mode.add_argument("--real", dest="stub", action="store_false", help="load the real models")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint per pass")
+    # Keep below the SQLAlchemy pool size (5 + 10 overflow): the /vocab handlers use a
+    # sync Session inside async endpoints, so pool exhaustion blocks the event loop.
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--vocab-rows", type=int, default=1000)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--only", nargs="*", help="substring filter on endpoint names")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(args.stub, os.path.join(tmp, "bench.db"), args.stub_latency_ms)
+        app = load_app(args.vocab_rows)
+        scenarios = build_scenarios(args.vocab_rows)
+
+        results = asyncio.run(
+            run_suite(app, scenarios, args.requests, args.concurrency, args.warmup, args.only)
+        )
+
+    report = {
+        "meta": {
+            "models": "stub" if args.stub else "real",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions vs baseline:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("No regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
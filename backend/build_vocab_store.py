@@ -0,0 +1,78 @@
+# build_vocab_store.py
+# Export models.Vocabulary into the memory-mapped columnar store read by app/vocab_store.py.
+#
+#   python build_vocab_store.py            full rebuild (replaces any delta)
+#   python build_vocab_store.py --delta    only rows added since the last full build
+
+import argparse
+import os
+import shutil
+import time
+
+from app.database import SessionLocal
+from app import models
+from app.vocab_store import VOCAB_STORE_DIR, build_columns, content_hash, write_store
+
+
+def load_rows(min_id: int = 0):
+    db = SessionLocal()
+    try:
+        q = db.query(models.Vocabulary).filter(models.Vocabulary.id > min_id).order_by(models.Vocabulary.id)
+        return [{"id": v.id, "english_word": v.english_word, "french_word": v.french_word} for v in q.all()]
+    finally:
+        db.close()
+
+
+def load_embedder():
+    from sentence_transformers import SentenceTransformer
+    from app.ai_models.conversation_bot import SENTENCE_MODEL
+
+    return SentenceTransformer(SENTENCE_MODEL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-normalized / pre-embedded vocabulary store.")
+    parser.add_argument("--out", default=VOCAB_STORE_DIR)
+    parser.add_argument("--delta", action="store_true", help="write rows added since the last full build")
+    parser.add_argument("--no-embeddings", action="store_true")
+    args = parser.parse_args()
+
+    manifest = {
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "embedding_model": None,
+    }
+    if not args.no_embeddings:
+        from app.ai_models.conversation_bot import SENTENCE_MODEL
+
+        manifest["embedding_model"] = SENTENCE_MODEL
+
+    if args.delta:
+        from app.vocab_store import VocabStore
+
+        base = VocabStore(args.out)
+        rows = load_rows(min_id=base.manifest["max_id"])
+        manifest.update(base_version=base.version)
+        target = os.path.join(args.out, "delta")
+    else:
+        rows = load_rows()
+        target = args.out
+
+    print(f"Encoding {len(rows)} rows...")
+    columns = build_columns(rows, None if args.no_embeddings else load_embedder())
+    manifest.update(version=content_hash(rows), max_id=max((r["id"] for r in rows), default=0))
+
+    # Build next to the target and swap it in, so readers never see a partial store
+    tmp = target.rstrip("/\\") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    write_store(tmp, columns, manifest)
+    old = target.rstrip("/\\") + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(target):
+        os.rename(target, old)
+    os.rename(tmp, target)
+    shutil.rmtree(old, ignore_errors=True)
+    print(f"Done. {target} version {manifest['version']} ({len(rows)} rows).")
+
+
+if __name__ == "__main__":
+    main()
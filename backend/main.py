@@ -1,19 +1,55 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response, Query, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import Literal, Optional
+import asyncio
+import json
 import os
-from app.ai_models.translator import SmartTranslator
-from app.ai_models.pronunciation_checker import PronunciationChecker
-from app.ai_models.conversation_bot import FrenchConversationBot
+import tempfile
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.cache import get_vocab_cached, invalidate_vocab_cache
 from app import models
 from app.schemas import VocabularyCreate
+from app.ai_models.decoding import load_tracker
+from app.ai_models.streaming import StreamingPronunciationSession
+from app.metrics import REQUEST_LATENCY, render_latest
+from app import profiling
+from app.startup import ModelRegistry
+
+# ------------------- AI Modules ---------------------------------------
+# Models load in background threads once the app starts (see app/startup.py);
+# routes that don't need a model are served immediately.
+model_registry = ModelRegistry()
+app_import_s = round(time.perf_counter() - _import_started, 3)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    model_registry.start()
+    yield
+    model_registry.shutdown()
+
+def require_model(name: str):
+    def dependency():
+        instance = model_registry.get(name)
+        if instance is None:
+            status = model_registry.status(name)
+            raise HTTPException(
+                status_code=503,
+                detail=f"{name} is {status}",
+                headers={"Retry-After": "5"} if status != "failed" else None,
+            )
+        return instance
+    return dependency
 
 # ------------------- FastAPI Setup -----------------------------------
-app = FastAPI(title="AI Language Learning API")
+app = FastAPI(title="AI Language Learning API", lifespan=lifespan)
 
 # Allow CORS for frontend development
 app.add_middleware(
@@ -24,26 +60,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ------------------- Initialize AI Modules ---------------------------
-translator = SmartTranslator()
-pronunciation_checker = PronunciationChecker()
-conversation_bot = FrenchConversationBot()
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    forced = bool(profiling.PROFILE_ADMIN_TOKEN) and request.headers.get("X-Profile") == profiling.PROFILE_ADMIN_TOKEN
+    if not (forced or profiling.should_profile(request.headers.get("X-Profile"))):
+        return await call_next(request)
+
+    root, token = profiling.start_profile(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        duration_ms = profiling.finish_profile(root, token)
+
+    if forced or profiling.is_slow(duration_ms):
+        meta = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 3),
+            "forced": forced,
+        }
+        if forced:
+            response.headers["X-Profile-Id"] = profiling.write_profile(root, meta)
+        else:
+            # Slow-request capture happens off the request path
+            asyncio.get_running_loop().run_in_executor(None, profiling.write_profile, root, meta)
+    return response
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/vocab/{word_id}), not the raw path, to bound cardinality
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.labels(request.method, path, str(status)).observe(time.perf_counter() - start)
 
 # ------------------- Request Models ---------------------------------
+QualityMode = Literal["fast", "balanced", "best"]
+
 class TranslationRequest(BaseModel):
     text: str
     source_language: str = "en"
+    quality: Optional[QualityMode] = None  # None -> DEFAULT_QUALITY
 
 class ConversationRequest(BaseModel):
     message: str
     scenario: str = "general"
+    quality: Optional[QualityMode] = None
 
 # ------------------- Endpoints --------------------------------------
 
 @app.post("/translate")
-async def translate(request: TranslationRequest):
+async def translate(request: TranslationRequest, translator=Depends(require_model("translator"))):
     try:
-        translation = translator.translate(request.text, request.source_language)
+        with load_tracker.track():
+            translation = await run_in_threadpool(
+                translator.translate, request.text, request.source_language, request.quality
+            )
         return {
             "original": request.text,
             "translation": translation,
@@ -53,9 +132,12 @@ async def translate(request: TranslationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/translate-batch")
-async def translate_batch(request: TranslationRequest):
+async def translate_batch(request: TranslationRequest, translator=Depends(require_model("translator"))):
     try:
-        translations = translator.translate_batch([request.text], request.source_language)
+        with load_tracker.track():
+            translations = await run_in_threadpool(
+                translator.translate_batch, [request.text], request.source_language, request.quality
+            )
         return {
             "original": request.text,
             "translations": translations,
@@ -65,29 +147,93 @@ async def translate_batch(request: TranslationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/check-pronunciation")
-async def check_pronunciation(audio: UploadFile = File(...), expected_text: str = ""):
+async def check_pronunciation(
+    audio: UploadFile = File(...),
+    expected_text: str = "",
+    pronunciation_checker=Depends(require_model("pronunciation_checker")),
+):
+    temp_path = None
     try:
-        temp_path = f"temp_{audio.filename}"
-        with open(temp_path, "wb") as f:
+        # Unique per request: recorders often send a fixed name ("blob", "recording.webm")
+        # and the transcription below yields to other requests
+        fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(audio.filename or "")[1])
+        with os.fdopen(fd, "wb") as f:
             f.write(await audio.read())
-        result = pronunciation_checker.check_pronunciation(temp_path, expected_text)
-        os.remove(temp_path)
-        return result
+        return await run_in_threadpool(pronunciation_checker.check_pronunciation, temp_path, expected_text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+
+@app.websocket("/ws/check-pronunciation")
+async def stream_pronunciation(
+    websocket: WebSocket,
+    expected_text: str = "",
+    sample_rate: int = Query(16000, gt=0),
+):
+    """Binary frames: PCM16 mono audio. Text frame {"type": "end"} requests the final score.
+
+    Sends {"type": "partial", ...} after each completed speech segment and
+    {"type": "final", ...} (the /check-pronunciation payload) at the end.
+    """
+    await websocket.accept()
+    pronunciation_checker = model_registry.get("pronunciation_checker")
+    if pronunciation_checker is None:
+        await websocket.close(code=1013, reason="pronunciation_checker is not ready")
+        return
+    session = StreamingPronunciationSession(pronunciation_checker, expected_text, sample_rate)
+    segments: asyncio.Queue = asyncio.Queue()
+
+    async def transcribe_segments():
+        # Runs alongside the receive loop so audio keeps flowing while Whisper works
+        while True:
+            audio = await segments.get()
+            if audio is None:
+                return
+            await websocket.send_json(await run_in_threadpool(session.add_segment, audio))
+
+    worker = asyncio.create_task(transcribe_segments())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if worker.done():
+                # Transcription failed; report it now rather than after "end"
+                worker.result()
+            if message.get("bytes"):
+                for audio in session.feed(message["bytes"]):
+                    segments.put_nowait(audio)
+            elif message.get("text") and json.loads(message["text"]).get("type") == "end":
+                break
+
+        segments.put_nowait(None)
+        await worker
+        await websocket.send_json(await run_in_threadpool(session.finish))
+        await websocket.close()
+    except WebSocketDisconnect:
+        worker.cancel()
+    except Exception as e:
+        worker.cancel()
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
 
 @app.post("/tts")
-async def generate_tts(text: str):
+async def generate_tts(text: str, pronunciation_checker=Depends(require_model("pronunciation_checker"))):
     try:
-        audio_bytes = pronunciation_checker.generate_tts(text)
+        audio_bytes = await run_in_threadpool(pronunciation_checker.generate_tts, text)
         return {"audio_bytes": audio_bytes.hex()}  # Can convert to base64 in frontend if needed
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/conversation")
-async def conversation(request: ConversationRequest):
+async def conversation(request: ConversationRequest, conversation_bot=Depends(require_model("conversation_bot"))):
     try:
-        response = conversation_bot.generate_response(request.message, request.scenario)
+        with load_tracker.track():
+            response = await run_in_threadpool(
+                conversation_bot.generate_response, request.message, request.scenario, request.quality
+            )
         return {"user_message": request.message, "bot_response": response, "scenario": request.scenario}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -157,6 +303,23 @@ async def create_vocab(payload: VocabularyCreate, db: Session = Depends(get_db))
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/ready")
+async def ready():
+    # Pings the model server when MODEL_BACKEND=server, so keep it off the loop
+    report = await run_in_threadpool(model_registry.check)
+    if not report["ready"]:
+        raise HTTPException(status_code=503, detail=report)
+    return report
+
+@app.get("/startup-report")
+async def startup_report():
+    return {"app_import_s": app_import_s, **model_registry.report()}
+
 @app.get("/")
 async def root():
     return {"message": "AI Language Learning API is running!"}
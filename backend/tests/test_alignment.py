@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from app.ai_models import alignment
+from app.ai_models.alignment import INSERT, MATCH, SUBSTITUTE, align, align_batch, normalize, tokenize
+
+
+def levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i]
+        for j, y in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = cur
+    return prev[-1]
+
+
+def errors(result):
+    return result["substitutions"] + result["insertions"] + result["deletions"]
+
+
+def test_matches_reference_levenshtein():
+    rng = random.Random(0)
+    words = "le la un chat chien est très bon".split()
+    for _ in range(500):
+        ref = [rng.choice(words) for _ in range(rng.randint(0, 12))]
+        hyp = [rng.choice(words) for _ in range(rng.randint(0, 12))]
+        result = align(" ".join(ref), " ".join(hyp))
+        assert errors(result) == levenshtein(ref, hyp)
+        # The ops replay both sequences in order
+        assert [o["expected"] for o in result["ops"] if o["expected"] is not None] == ref
+        assert [o["actual"] for o in result["ops"] if o["actual"] is not None] == hyp
+
+
+def test_prefers_substitution_over_delete_insert():
+    result = align("je mange une pomme", "je mange une poire")
+    assert [o["op"] for o in result["ops"]] == [MATCH, MATCH, MATCH, SUBSTITUTE]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("l'homme", "l homme"),
+        ("L’Été!", "l ete"),
+        ("qu'il vienne", "qu il vienne"),
+        ("jusqu'à demain", "jusqu a demain"),
+        ("Lorsqu'elle arrive, c'est fini.", "lorsqu elle arrive c est fini"),
+        ("aujourd'hui", "aujourdhui"),
+    ],
+)
+def test_normalize_elision(text, expected):
+    assert normalize(text) == expected
+
+
+def test_elided_and_spaced_forms_align():
+    assert align("Qu'il parte jusqu'à l'école", "qu il parte jusqu a l ecole")["score"] == 1.0
+
+
+def test_surface_forms_are_kept():
+    assert [surface for surface, _ in tokenize("« Bonjour, l'ami ! »")] == ["Bonjour", "l'", "ami"]
+
+
+def test_empty_inputs():
+    assert align("", "") == {
+        "ops": [], "matches": 0, "substitutions": 0, "insertions": 0, "deletions": 0, "wer": 0.0, "score": 1.0,
+    }
+    assert align("", "bonjour")["ops"] == [{"op": INSERT, "expected": None, "actual": "bonjour"}]
+    assert align("", "bonjour")["score"] == 0.0
+    result = align("bonjour madame", "  ")
+    assert result["deletions"] == 2 and result["wer"] == 1.0
+
+
+def test_long_passage():
+    rng = random.Random(1)
+    ref = [f"mot{rng.randint(0, 300)}" for _ in range(2000)]
+    hyp = list(ref)
+    hyp[700] = "erreur"
+    del hyp[1500]
+    result = align(" ".join(ref), " ".join(hyp))
+    assert (result["substitutions"], result["deletions"], result["insertions"]) == (1, 1, 0)
+    assert result["matches"] == 1998
+
+
+def test_size_limit(monkeypatch):
+    monkeypatch.setattr(alignment, "MAX_ALIGN_CELLS", 100)
+    with pytest.raises(ValueError):
+        align(" ".join(["a"] * 20), " ".join(["a"] * 20))
+
+
+def test_align_batch_matches_align():
+    attempts = ["bonjour madame", "bonjour", "", "bonsoir madame"]
+    assert align_batch("Bonjour, madame !", attempts) == [align("Bonjour, madame !", a) for a in attempts]
+    assert align_batch("bonjour", []) == []
@@ -0,0 +1,99 @@
+import threading
+from contextlib import ExitStack
+
+import pytest
+
+from app.ai_models import decoding
+from app.ai_models.decoding import LoadTracker, generation_kwargs, resolve_quality
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch):
+    monkeypatch.setattr(decoding, "DEFAULT_QUALITY", "best")
+    monkeypatch.setattr(decoding, "DOWNGRADE_QUEUE_DEPTH", 8)
+
+
+def test_resolve_quality_defaults_and_validates():
+    assert resolve_quality(None, 0) == "best"
+    assert resolve_quality("Balanced", 0) == "balanced"
+    with pytest.raises(ValueError, match="unknown quality mode"):
+        resolve_quality("ultra", 0)
+
+
+def test_downgrade_above_queue_depth():
+    assert resolve_quality("best", 8) == "best"
+    assert resolve_quality("best", 9) == "fast"
+    assert resolve_quality(None, 100) == "fast"
+    # Unknown modes are rejected even under load
+    with pytest.raises(ValueError):
+        resolve_quality("ultra", 100)
+
+
+def test_downgrade_uses_load_tracker_by_default(monkeypatch):
+    tracker = LoadTracker()
+    monkeypatch.setattr(decoding, "load_tracker", tracker)
+    with ExitStack() as stack:
+        for _ in range(9):
+            stack.enter_context(tracker.track())
+        assert tracker.depth == 9
+        assert resolve_quality("best") == "fast"
+    assert tracker.depth == 0
+    assert resolve_quality("best") == "best"
+
+
+def test_load_tracker_is_thread_safe():
+    tracker = LoadTracker()
+
+    def work():
+        for _ in range(1000):
+            with tracker.track():
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert tracker.depth == 0
+
+
+def test_best_keeps_the_callers_budget():
+    assert generation_kwargs("best", 5, max_cap=128) == {"max_new_tokens": 128, "num_beams": 4, "early_stopping": True}
+    # Conversation bot: greedy, 50 tokens, no early_stopping
+    assert generation_kwargs("best", 3, max_cap=50, num_beams=1, min_tokens=32) == {"max_new_tokens": 50, "num_beams": 1}
+
+
+def test_length_derived_budget():
+    # fast: 2.0 x input + min_tokens, greedy
+    assert generation_kwargs("fast", 10, max_cap=128) == {"max_new_tokens": 36, "num_beams": 1}
+    # balanced: 3.0 x input + min_tokens, beam 2
+    assert generation_kwargs("balanced", 10, max_cap=128) == {"max_new_tokens": 46, "num_beams": 2, "early_stopping": True}
+    # Capped at max_cap
+    assert generation_kwargs("balanced", 100, max_cap=128)["max_new_tokens"] == 128
+
+
+def test_min_tokens_floor():
+    assert generation_kwargs("fast", 0, max_cap=128)["max_new_tokens"] == 16
+    assert generation_kwargs("fast", 3, max_cap=50, num_beams=1, min_tokens=32)["max_new_tokens"] == 38
+    # The floor wins over a cap below it
+    assert generation_kwargs("fast", 3, max_cap=10, min_tokens=16)["max_new_tokens"] == 16
+
+
+def test_modes_never_widen_the_callers_beam():
+    assert generation_kwargs("balanced", 5, max_cap=50, num_beams=1) == {"max_new_tokens": 31, "num_beams": 1}
+    assert "early_stopping" not in generation_kwargs("fast", 5, max_cap=128, num_beams=4)
+
+
+def test_apply_thread_budget_only_under_load(monkeypatch):
+    torch = pytest.importorskip("torch")
+    monkeypatch.setattr(decoding, "_default_threads", None)
+    original = torch.get_num_threads()
+    try:
+        decoding.apply_thread_budget(depth=1)
+        assert torch.get_num_threads() == original
+        decoding.apply_thread_budget(depth=100)
+        assert torch.get_num_threads() == max(1, original // 100)
+        decoding.apply_thread_budget(depth=0)
+        assert torch.get_num_threads() == original
+    finally:
+        torch.set_num_threads(original)
@@ -0,0 +1,210 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+from multiprocessing import AuthenticationError
+
+from app import profiling
+from app.ai_models import model_server as ms
+from app.ai_models.stubs import StubFrenchConversationBot, StubPronunciationChecker, StubTranslator
+
+AUTHKEY = b"test-key"
+
+
+class RecordingTranslator(StubTranslator):
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def translate_batch(self, texts, source_language="en", quality=None):
+        self.calls.append(("translate_batch", list(texts), source_language, quality))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return super().translate_batch(texts, source_language, quality)
+
+    def translate_with_confidence(self, texts, source_language="en", *args):
+        self.calls.append(("translate_with_confidence", list(texts), source_language, None))
+        return [[t] for t in texts]
+
+
+class SlowTTSChecker(StubPronunciationChecker):
+    def generate_tts(self, text, lang="fr"):
+        time.sleep(0.5)
+        return b"audio"
+
+
+def make_server(tmp_path, translator=None, checker=None):
+    return ms.ModelServer(
+        address=str(tmp_path / "models" / "m.sock"),
+        authkey=AUTHKEY,
+        targets={
+            "translator": translator or RecordingTranslator(),
+            "pronunciation_checker": checker or StubPronunciationChecker(),
+            "conversation_bot": StubFrenchConversationBot(),
+        },
+    )
+
+
+# ------------------- Batching (no socket) -----------------------------
+
+def run_translate_lane(server, jobs):
+    """Queue every job before the worker starts, so they all fall in one window."""
+    for job in jobs:
+        server.lanes["translator"].put(job)
+    threading.Thread(target=server._translate_loop, daemon=True).start()
+    for job in jobs:
+        assert job.done.wait(5)
+
+
+def job(method, *args, **kwargs):
+    kwargs.setdefault("quality", "best")
+    return ms._Job("translator", method, args, kwargs)
+
+
+def test_same_key_jobs_share_one_model_call(tmp_path):
+    server = make_server(tmp_path)
+    jobs = [
+        job("translate", "hello", "en"),
+        job("translate_batch", ["good", "morning"], "en"),
+        job("translate", "bye", "en"),
+    ]
+    run_translate_lane(server, jobs)
+
+    assert server.targets["translator"].calls == [
+        ("translate_batch", ["hello", "good", "morning", "bye"], "en", "best"),
+    ]
+    # The flat result is sliced back per job
+    assert [j.result for j in jobs] == ["[fr] hello", ["[fr] good", "[fr] morning"], "[fr] bye"]
+    assert all(j.error is None for j in jobs)
+
+
+def test_other_keys_are_deferred_until_after_the_batch(tmp_path):
+    server = make_server(tmp_path)
+    jobs = [
+        job("translate", "hello", "en"),
+        job("translate", "bonjour", "fr"),          # other language
+        job("translate", "fast one", "en", quality="fast"),  # other quality
+        ms._Job("translator", "translate_with_confidence", (["maybe"], "en"), {}),  # not batchable
+        job("translate", "world", "en"),
+    ]
+    run_translate_lane(server, jobs)
+
+    assert server.targets["translator"].calls == [
+        ("translate_batch", ["hello", "world"], "en", "best"),
+        ("translate_batch", ["bonjour"], "fr", "best"),
+        ("translate_batch", ["fast one"], "en", "fast"),
+        ("translate_with_confidence", ["maybe"], "en", None),
+    ]
+    assert [j.result for j in jobs] == ["[fr] hello", "[en] bonjour", "[fr] fast one", [["maybe"]], "[fr] world"]
+
+
+def test_batch_key():
+    assert ms.ModelServer._batch_key(job("translate", "a", "en")) == ("en", "best")
+    assert ms.ModelServer._batch_key(job("translate", "a", source_language="fr", quality="fast")) == ("fr", "fast")
+    assert ms.ModelServer._batch_key(job("translate_batch", ["a"])) == ("en", "best")
+
+
+def test_blank_input_falls_back_to_a_single_call(tmp_path):
+    server = make_server(tmp_path)
+    jobs = [job("translate", "hello", "en"), job("translate", "   ", "en"), job("translate_batch", ["", "x"], "en")]
+    run_translate_lane(server, jobs)
+
+    assert jobs[0].result == "[fr] hello"
+    # Same failure as calling the translator locally with blank text
+    assert jobs[1].error is not None and "IndexError" in jobs[1].error
+    assert jobs[2].result == ["[fr] x"]
+
+
+def test_batch_error_reaches_every_job(tmp_path):
+    server = make_server(tmp_path, translator=RecordingTranslator(fail=True))
+    jobs = [job("translate", "a", "en"), job("translate", "b", "en")]
+    run_translate_lane(server, jobs)
+
+    assert len(server.targets["translator"].calls) == 1
+    assert all(j.result is None and "model exploded" in j.error for j in jobs)
+
+
+# ------------------- Over the socket ----------------------------------
+
+@pytest.fixture
+def serve(tmp_path):
+    def start(**kwargs):
+        server = make_server(tmp_path, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        deadline = time.monotonic() + 5
+        while not os.path.exists(server.address):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        return server
+
+    return start
+
+
+def proxy(cls, server, authkey=AUTHKEY):
+    return cls(address=server.address, authkey=authkey)
+
+
+def test_round_trip_and_socket_permissions(serve):
+    server = serve()
+    assert proxy(ms.RemoteSmartTranslator, server).translate("hello") == "[fr] hello"
+    assert proxy(ms.RemoteFrenchConversationBot, server).generate_response("hi", "cafe").startswith("(cafe)")
+    assert stat.S_IMODE(os.stat(server.address).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(server.address)).st_mode) == 0o700
+
+
+def test_errors_become_remote_error(serve):
+    server = serve(translator=RecordingTranslator(fail=True))
+    translator = proxy(ms.RemoteSmartTranslator, server)
+    with pytest.raises(ms.RemoteError, match="model exploded"):
+        translator.translate("hello")
+    with pytest.raises(ms.RemoteError, match="unknown method"):
+        translator._call("__init__")
+    with pytest.raises(ms.RemoteError, match="unknown quality mode"):
+        translator.translate("hello", quality="ultra")
+    # The connection survives server-side errors
+    assert translator.ping()
+
+
+def test_round_trip_is_profiled(serve):
+    server = serve()
+    root, token = profiling.start_profile("POST /translate")
+    try:
+        proxy(ms.RemoteSmartTranslator, server).translate("hello")
+    finally:
+        profiling.finish_profile(root, token)
+    assert [child.name for child in root.children] == ["model_server:translator.translate"]
+    assert root.children[0].end is not None
+
+
+def test_wrong_authkey_does_not_stop_the_server(serve):
+    server = serve()
+    with pytest.raises(AuthenticationError):
+        proxy(ms.RemoteSmartTranslator, server, authkey=b"wrong").translate("hello")
+    assert proxy(ms.RemoteSmartTranslator, server).translate("hello") == "[fr] hello"
+
+
+def test_ping(serve, tmp_path):
+    server = serve()
+    assert proxy(ms.RemotePronunciationChecker, server).ping()
+    missing = ms.RemotePronunciationChecker(address=str(tmp_path / "nothing.sock"), authkey=AUTHKEY)
+    assert not missing.ping()
+    assert not proxy(ms.RemoteSmartTranslator, server, authkey=b"wrong").ping()
+
+
+def test_authkey_is_required(monkeypatch):
+    monkeypatch.delenv("MODEL_SERVER_AUTHKEY", raising=False)
+    with pytest.raises(RuntimeError, match="MODEL_SERVER_AUTHKEY"):
+        ms.RemoteSmartTranslator(address="unused.sock")
+
+
+def test_tts_does_not_block_translation(serve):
+    server = serve(checker=SlowTTSChecker())
+    tts = threading.Thread(target=proxy(ms.RemotePronunciationChecker, server).generate_tts, args=("bonjour",))
+    tts.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    assert proxy(ms.RemoteSmartTranslator, server).translate("hello") == "[fr] hello"
+    assert time.monotonic() - start < 0.3
+    tts.join()
@@ -0,0 +1,42 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("whisper")
+pytest.importorskip("gtts")
+
+from app.ai_models.pronunciation_checker import PronunciationChecker
+
+
+class OverlapDetectingModel:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio, language=None, initial_prompt=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return {"text": "bonjour"}
+
+
+def test_concurrent_transcriptions_are_serialized():
+    checker = PronunciationChecker.__new__(PronunciationChecker)
+    checker.model_name = "whisper-test"
+    checker.model = OverlapDetectingModel()
+    checker._transcribe_lock = threading.Lock()
+
+    audio = np.zeros(1600, dtype=np.float32)
+    threads = [threading.Thread(target=checker.transcribe_audio, args=(audio,)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert checker.model.max_active == 1
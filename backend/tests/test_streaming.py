@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from app.ai_models.streaming import SpeechSegmenter, StreamingPronunciationSession
+
+RATE = 16000
+
+
+def pcm(seconds, amplitude=0.3, rate=RATE):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * 440 * t) * 32767).astype("<i2").tobytes()
+
+
+def silence(seconds, rate=RATE):
+    return np.zeros(int(seconds * rate), dtype="<i2").tobytes()
+
+
+def feed_all(segmenter, chunks):
+    segments = []
+    for chunk in chunks:
+        segments.extend(segmenter.feed(chunk))
+    return segments
+
+
+def test_speech_then_silence_completes_one_segment():
+    segments = feed_all(SpeechSegmenter(), [silence(0.5), pcm(1.0), silence(1.0)])
+    assert len(segments) == 1
+    # The utterance plus at most the pre-roll and one frame of rounding
+    assert RATE <= len(segments[0]) <= RATE + int(0.15 * RATE) + 480
+
+
+def test_silence_only():
+    segmenter = SpeechSegmenter()
+    assert feed_all(segmenter, [silence(2.0)]) == []
+    assert segmenter.flush() is None
+
+
+def test_odd_byte_chunks_match_whole_stream():
+    stream = silence(0.2) + pcm(0.8) + silence(0.7) + pcm(0.5, amplitude=0.2) + silence(0.7)
+    whole = SpeechSegmenter().feed(stream)
+
+    split = SpeechSegmenter()
+    # Odd-sized chunks split every other sample across two feeds
+    chunks = [stream[i:i + 333] for i in range(0, len(stream), 333)]
+    pieces = feed_all(split, chunks)
+
+    assert len(whole) == len(pieces) == 2
+    for a, b in zip(whole, pieces):
+        np.testing.assert_array_equal(a, b)
+    assert split.pending == b""
+
+
+def test_trailing_odd_byte_is_kept():
+    segmenter = SpeechSegmenter()
+    data = pcm(0.1)
+    segmenter.feed(data[:101])
+    assert segmenter.pending == data[100:101]
+    segmenter.feed(data[101:])
+    assert segmenter.pending == b""
+
+
+def test_flush_returns_unfinished_speech():
+    segmenter = SpeechSegmenter()
+    assert feed_all(segmenter, [pcm(0.6)]) == []
+    tail = segmenter.flush()
+    assert tail is not None and len(tail) >= int(0.5 * RATE)
+    assert segmenter.flush() is None
+
+
+def test_long_speech_is_cut_at_max_segment():
+    segments = feed_all(SpeechSegmenter(max_segment_s=1.0), [pcm(2.5)])
+    assert len(segments) == 2
+    # Cuts land on the first 30 ms frame boundary at or past the limit
+    assert all(RATE <= len(s) < RATE + 480 for s in segments)
+
+
+def test_resamples_to_whisper_rate():
+    segments = feed_all(SpeechSegmenter(sample_rate=8000), [pcm(1.0, rate=8000), silence(1.0, rate=8000)])
+    assert len(segments) == 1
+    assert segments[0].dtype == np.float32
+    assert RATE <= len(segments[0]) <= RATE + int(0.15 * RATE) + 480
+
+
+def test_rejects_non_positive_sample_rate():
+    with pytest.raises(ValueError):
+        SpeechSegmenter(sample_rate=0)
+
+
+class FakeChecker:
+    def __init__(self, words):
+        self.words = list(words)
+        self.prompts = []
+
+    def transcribe_audio(self, audio, language="fr", initial_prompt=None):
+        self.prompts.append(initial_prompt)
+        return self.words.pop(0)
+
+    def score_transcription(self, expected_text, transcribed_text):
+        return {"transcribed": transcribed_text}
+
+
+def test_session_partial_and_final():
+    checker = FakeChecker(["bonjour", "madame"])
+    session = StreamingPronunciationSession(checker, "bonjour madame comment allez-vous")
+    segments = session.feed(pcm(0.5) + silence(1.0))
+    assert len(segments) == 1
+
+    partial = session.add_segment(segments[0])
+    assert partial["words_read"] == 1
+    assert partial["words_total"] == 4
+    assert partial["similarity_score"] == 1.0
+
+    session.feed(pcm(0.5))
+    final = session.finish()
+    assert final == {"type": "final", "transcribed": "bonjour madame"}
+    assert checker.prompts == [None, "bonjour"]
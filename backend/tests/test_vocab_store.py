@@ -0,0 +1,97 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.vocab_store import VocabStore, build_columns, content_hash, match_surface, write_store
+
+BASE_ROWS = [
+    {"id": 1, "english_word": "Goodbye", "french_word": "au revoir"},
+    {"id": 2, "english_word": "the summer", "french_word": "l'été"},
+    {"id": 3, "english_word": "thank you", "french_word": "merci"},
+]
+DELTA_ROWS = [{"id": 4, "english_word": "cheese", "french_word": "fromage"}]
+
+
+class FakeEmbedder:
+    def encode(self, texts, batch_size=32):
+        return np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+
+
+def build(path, rows, embedder=None, **manifest):
+    manifest = {"version": content_hash(rows), "max_id": max(r["id"] for r in rows), **manifest}
+    write_store(str(path), build_columns(rows, embedder), manifest)
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    build(tmp_path, BASE_ROWS, FakeEmbedder())
+    return tmp_path
+
+
+def test_round_trip(store_dir):
+    store = VocabStore(str(store_dir))
+    assert len(store) == 3
+    assert store.version == content_hash(BASE_ROWS)
+    assert store.row(2) == {
+        "id": 2, "english": "the summer", "french": "l'été", "en_norm": "the summer", "fr_norm": "l ete",
+    }
+    assert store.row(99) is None
+    assert store.strings("french") == ["au revoir", "l'été", "merci"]
+    np.testing.assert_array_equal(store.embeddings("en_emb"), FakeEmbedder().encode(["Goodbye", "the summer", "thank you"]))
+    assert store.embeddings("en_emb").dtype == np.float32
+
+
+def test_store_without_embeddings(tmp_path):
+    build(tmp_path, BASE_ROWS)
+    store = VocabStore(str(tmp_path))
+    assert store.has("french") and not store.has("en_emb")
+    assert not os.path.exists(tmp_path / "en_emb.npy")
+
+
+def test_french_for_matches_input_surface(store_dir):
+    store = VocabStore(str(store_dir))
+    assert store.french_for("goodbye") == "au revoir"
+    assert store.french_for("Goodbye!") == "Au revoir!"
+    assert store.french_for("  THANK YOU.  ") == "MERCI."
+    assert store.french_for("The summer?") == "L'été?"
+    assert store.french_for("hello") is None
+
+
+@pytest.mark.parametrize(
+    "source, target, expected",
+    [
+        ("hello", "bonjour", "bonjour"),
+        ("Hello", "bonjour", "Bonjour"),
+        ("«Hello»", "bonjour", "«Bonjour»"),
+        ("hello", "Bonjour !", "Bonjour !"),
+        ("Hello?", "bonjour !", "Bonjour?"),
+        ("I", "je", "Je"),
+    ],
+)
+def test_match_surface(source, target, expected):
+    assert match_surface(source, target) == expected
+
+
+def test_delta_applied_when_base_version_matches(store_dir):
+    build(store_dir / "delta", DELTA_ROWS, FakeEmbedder(), base_version=content_hash(BASE_ROWS))
+    store = VocabStore(str(store_dir))
+    assert len(store) == 4
+    assert store.french_for("Cheese") == "Fromage"
+    assert store.strings("english") == ["Goodbye", "the summer", "thank you", "cheese"]
+    assert store.embeddings("en_emb").shape == (4, 2)
+
+
+def test_delta_ignored_for_other_base(store_dir):
+    build(store_dir / "delta", DELTA_ROWS, FakeEmbedder(), base_version="stale")
+    store = VocabStore(str(store_dir))
+    assert len(store) == 3
+    assert store.french_for("cheese") is None
+    assert store.row(4) is None
+
+
+def test_manifest_counts(store_dir):
+    with open(store_dir / "manifest.json") as f:
+        manifest = json.load(f)
+    assert manifest["rows"] == 3 and manifest["max_id"] == 3